@@ -7,6 +7,7 @@ from .spectrum import (
     SignalRecorder,
     FrequencyScanner,
     Signal,
+    SignalBatch,
     SpectrumFrame
 )
 
@@ -15,5 +16,6 @@ __all__ = [
     "SignalRecorder",
     "FrequencyScanner",
     "Signal",
+    "SignalBatch",
     "SpectrumFrame"
 ]
@@ -6,15 +6,152 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from scipy import signal
-from scipy.fftpack import fft, fftshift, fftfreq
+from scipy.fft import (fft, rfft, fftshift, fftfreq, rfftfreq, next_fast_len,
+                       set_workers, set_backend)
 import asyncio
 import json
 import os
+import math
 import wave
+import logging
+from contextlib import nullcontext
 from datetime import datetime
-from collections import deque
+from collections import Counter, deque
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+def _select_fft_backend(choice: str) -> Tuple[str, Optional[Any]]:
+    """Pick an optional faster scipy.fft backend, returning (name, backend).
+
+    SDR_FFT_BACKEND picks one of: scipy (default), auto (MKL, then pyFFTW,
+    else scipy), mkl or pyfftw. The backend is only applied around this
+    module's own FFT calls (see _fft_backend), never process-wide; anything
+    it does not implement still falls through to scipy's own pocketfft.
+    """
+    if choice not in ("scipy", "auto", "mkl", "pyfftw"):
+        logger.warning(f"Unknown SDR_FFT_BACKEND {choice!r}, using scipy")
+        return "scipy", None
+
+    if choice in ("auto", "mkl"):
+        try:
+            import mkl_fft._scipy_fft_backend as mkl_backend
+            return "mkl", mkl_backend
+        except ImportError as e:
+            if choice == "mkl":
+                logger.warning(f"MKL FFT backend not available: {e}. Install with: pip install mkl_fft")
+
+    if choice in ("auto", "pyfftw"):
+        try:
+            import pyfftw
+            import pyfftw.interfaces.scipy_fft as pyfftw_backend
+            pyfftw.interfaces.cache.enable()
+            pyfftw.config.NUM_THREADS = os.cpu_count() or 1
+            return "pyfftw", pyfftw_backend
+        except ImportError as e:
+            if choice == "pyfftw":
+                logger.warning(f"pyFFTW backend not available: {e}. Install with: pip install pyfftw")
+
+    return "scipy", None
+
+FFT_BACKEND, _FFT_BACKEND_MODULE = _select_fft_backend(
+    os.environ.get("SDR_FFT_BACKEND", "scipy").lower())
+
+def _fft_workers_from_env() -> int:
+    """scipy.fft worker count from SDR_FFT_WORKERS (-1 = all cores)"""
+    value = os.environ.get("SDR_FFT_WORKERS", "-1")
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers == 0 or workers < -(os.cpu_count() or 1):
+        logger.warning(f"Invalid SDR_FFT_WORKERS {value!r}, using all cores")
+        return -1
+    return workers
+
+def _fft_backend():
+    """Scope the selected FFT backend to a block (no-op for plain scipy)"""
+    if _FFT_BACKEND_MODULE is None:
+        return nullcontext()
+    return set_backend(_FFT_BACKEND_MODULE)
+
+# Common frequencies and their uses, in priority order (first match wins)
+KNOWN_SIGNAL_BANDS: List[Tuple[float, float, str]] = [
+    # Aviation
+    (108e6, 118e6, "Aviation AM"),
+    (118e6, 137e6, "Aviation AM"),
+    (1090e6, 1090e6, "ADS-B"),
+    (978e6, 978e6, "UAT"),
+
+    # Marine
+    (156e6, 162e6, "Marine VHF"),
+    (161.975e6, 162.025e6, "AIS"),
+
+    # Amateur Radio
+    (144e6, 148e6, "2m Amateur"),
+    (430e6, 440e6, "70cm Amateur"),
+    (14e6, 14.35e6, "20m Amateur"),
+
+    # Broadcast
+    (88e6, 108e6, "FM Broadcast"),
+    (535e3, 1705e3, "AM Broadcast"),
+
+    # Emergency
+    (150.8e6, 162.5e6, "Public Safety"),
+
+    # ISM
+    (433.05e6, 434.79e6, "ISM 433"),
+    (902e6, 928e6, "ISM 900"),
+    (2.4e9, 2.5e9, "ISM 2.4G"),
+]
+
+def _build_band_lookup(bands: List[Tuple[float, float, str]]) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Flatten overlapping bands into disjoint atoms for searchsorted lookup.
+
+    Atoms alternate gap, edge, gap, ... so atom 2*i+1 is edges[i] itself and
+    atom 2*i is the open interval before it. Each atom is labelled with the
+    first band that covers it, preserving the priority order above.
+    """
+    edges = np.unique([f for low, high, _ in bands for f in (low, high)])
+
+    def first_match(freq: float) -> Optional[str]:
+        for low, high, description in bands:
+            if low <= freq <= high:
+                return description
+        return None
+
+    labels: List[Optional[str]] = [None]
+    for i, edge in enumerate(edges):
+        labels.append(first_match(edge))
+        if i + 1 < len(edges):
+            labels.append(first_match((edge + edges[i + 1]) / 2))
+    labels.append(None)
+    return edges, labels
+
+_BAND_EDGES, _BAND_LABELS = _build_band_lookup(KNOWN_SIGNAL_BANDS)
+
+def _as_iq(samples: np.ndarray) -> np.ndarray:
+    """Normalize samples to contiguous complex64 (float32 for real input).
+
+    Already-conforming arrays are returned as-is, so drivers that deliver
+    complex64 pay nothing; anything else is converted once here.
+    """
+    samples = np.asarray(samples)
+    dtype = np.float32 if np.isrealobj(samples) else np.complex64
+    if samples.dtype == dtype and samples.flags.c_contiguous:
+        return samples
+
+    logger.debug(f"Converting {samples.dtype} samples to {np.dtype(dtype)}")
+    return np.ascontiguousarray(samples, dtype=dtype)
+
+def _known_band_labels(freqs: np.ndarray) -> List[Optional[str]]:
+    """Known band description (or None) for each absolute frequency"""
+    # Each frequency maps to one atom: left + right insertion points are
+    # even for the gaps between band edges and odd for the edges themselves
+    atoms = (np.searchsorted(_BAND_EDGES, freqs, side='left') +
+             np.searchsorted(_BAND_EDGES, freqs, side='right'))
+    return [_BAND_LABELS[atom] for atom in atoms.tolist()]
+
 @dataclass
 class Signal:
     """Detected signal information"""
@@ -25,9 +162,44 @@ class Signal:
     modulation_hint: Optional[str] = None
     confidence: float = 0.0
 
+@dataclass
+class SignalBatch:
+    """Detected signals as parallel arrays, one entry per signal"""
+    frequency: np.ndarray
+    power: np.ndarray
+    bandwidth: np.ndarray
+    snr: np.ndarray
+    modulation_hint: List[Optional[str]]
+    confidence: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.frequency)
+
+    @classmethod
+    def from_signals(cls, signals: List[Signal]) -> 'SignalBatch':
+        """Build a batch from Signal objects"""
+        return cls(
+            frequency=np.array([sig.frequency for sig in signals], dtype=float),
+            power=np.array([sig.power for sig in signals], dtype=float),
+            bandwidth=np.array([sig.bandwidth for sig in signals], dtype=float),
+            snr=np.array([sig.snr for sig in signals], dtype=float),
+            modulation_hint=[sig.modulation_hint for sig in signals],
+            confidence=np.array([sig.confidence for sig in signals], dtype=float),
+        )
+
+    def to_signals(self) -> List[Signal]:
+        """Expand into Signal objects (e.g. for serialization)"""
+        return [Signal(*fields) for fields in zip(
+            self.frequency.tolist(), self.power.tolist(), self.bandwidth.tolist(),
+            self.snr.tolist(), self.modulation_hint, self.confidence.tolist())]
+
+    def strongest(self) -> Optional[int]:
+        """Index of the highest-power signal, or None when empty"""
+        return int(np.argmax(self.power)) if len(self) else None
+
 @dataclass
 class SpectrumFrame:
-    """Single spectrum analysis frame"""
+    """Single spectrum analysis frame (power_db is float32 dB per bin)"""
     timestamp: datetime
     center_freq: float
     sample_rate: float
@@ -37,6 +209,41 @@ class SpectrumFrame:
     noise_floor: float
     detected_signals: List[Signal]
 
+class _SpectrumRing:
+    """Fixed-depth ring buffer of equal-length spectrum lines"""
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.data: Optional[np.ndarray] = None
+        self.head = 0
+        self.count = 0
+
+    def append(self, line: np.ndarray):
+        # (Re)allocate when the spectrum length changes
+        if self.data is None or self.data.shape[1] != len(line):
+            self.data = np.empty((self.depth, len(line)), dtype=np.float32)
+            self.head = 0
+            self.count = 0
+
+        self.data[self.head] = line
+        self.head = (self.head + 1) % self.depth
+        self.count = min(self.count + 1, self.depth)
+
+    def latest(self, num_lines: Optional[int] = None) -> np.ndarray:
+        """Newest num_lines lines (all by default), oldest first"""
+        if not self.count:
+            return np.array([])
+
+        count = self.count
+        if num_lines and num_lines < count:
+            count = num_lines
+
+        start = (self.head - count) % self.depth
+        end = start + count
+        if end <= self.depth:
+            return self.data[start:end]
+        return np.concatenate((self.data[start:], self.data[:end - self.depth]))
+
 class SpectrumAnalyzer:
     """Advanced spectrum analysis with signal detection and classification"""
     
@@ -45,27 +252,74 @@ class SpectrumAnalyzer:
                  window_type: str = 'blackman-harris',
                  overlap: float = 0.5,
                  averaging_alpha: float = 0.1):
+        if not 0 <= overlap < 1:
+            raise ValueError(f"Overlap must be in [0, 1), got {overlap}")
         self.fft_size = fft_size
         self.window_type = window_type
         self.overlap = overlap
         self.averaging_alpha = averaging_alpha
         
-        # Window function
+        # Window functions and their power correction (dB), cached by (window_type, size)
+        self._window_cache: Dict[Tuple[str, int], Tuple[np.ndarray, np.float32]] = {}
         self.window = self._get_window(window_type, fft_size)
+
+        # Reusable FFT input buffer (pocketfft caches its own plans per size)
+        self._fft_buffer: Optional[np.ndarray] = None
+
+        # pocketfft thread count (-1 = all cores), overridable via SDR_FFT_WORKERS
+        self._fft_workers = _fft_workers_from_env()
+
+        # Frequency axis for the last (n_fft, sample_rate, is_real) seen
+        self._freq_cache: Optional[Tuple[Tuple[int, float, bool], np.ndarray]] = None
         
         # Averaging buffers
         self.averaged_spectrum = None
         self.peak_hold = None
         
-        # Waterfall data
-        self.waterfall_history = deque(maxlen=100)
+        # Waterfall data: multi-tau hierarchy of preallocated rings. Level 0
+        # keeps the most recent spectra at full rate; each further level
+        # holds pair-averages of the one below at half its rate
+        self.waterfall_depth = 100
+        self.waterfall_level_depth = 16
+        self.waterfall_levels = 8
+        self._waterfall = [_SpectrumRing(self.waterfall_depth)] + [
+            _SpectrumRing(self.waterfall_level_depth)
+            for _ in range(self.waterfall_levels - 1)
+        ]
+        self._waterfall_carry: List[Optional[np.ndarray]] = [None] * self.waterfall_levels
         
         # Signal detection parameters
+        self._nf_scratch = np.empty(0, dtype=np.float32)
         self.noise_floor_db = -100
         self.signal_threshold_db = 10  # dB above noise floor
         
+    @property
+    def window(self) -> np.ndarray:
+        """Current window function"""
+        return self._window
+
+    @window.setter
+    def window(self, window: np.ndarray):
+        self._window = window
+        # Reuse the cached power correction when this is a cached window
+        entry = self._window_cache.get((self.window_type, len(window)))
+        if entry is not None and entry[0] is window:
+            self._win_db = entry[1]
+        else:
+            self._win_db = self._window_power_db(window)
+
+    @staticmethod
+    def _window_power_db(window: np.ndarray) -> np.float32:
+        """Window power correction in dB"""
+        return np.float32(10 * np.log10(np.sum(np.square(window, dtype=np.float64))))
+
     def _get_window(self, window_type: str, size: int) -> np.ndarray:
-        """Get window function"""
+        """Get window function (cached per type and size)"""
+        key = (window_type, size)
+        entry = self._window_cache.get(key)
+        if entry is not None:
+            return entry[0]
+
         windows = {
             'hamming': signal.windows.hamming,
             'hann': signal.windows.hann,
@@ -76,66 +330,186 @@ class SpectrumAnalyzer:
         }
         
         if window_type in windows:
-            return windows[window_type](size)
+            window = windows[window_type](size)
         else:
-            return np.ones(size)  # Rectangular window
+            window = np.ones(size)  # Rectangular window
+
+        # float32 is plenty for spectrum display and halves memory traffic
+        window = window.astype(np.float32)
+        self._window_cache[key] = (window, self._window_power_db(window))
+        return window
             
+    def _get_fft_buffer(self, size: int, dtype: np.dtype) -> np.ndarray:
+        """Get the reusable FFT input buffer, reallocating on size/dtype change"""
+        buf = self._fft_buffer
+        if buf is None or len(buf) != size or buf.dtype != dtype:
+            buf = np.empty(size, dtype=dtype)
+            self._fft_buffer = buf
+        return buf
+
+    def _get_freqs(self, n_fft: int, sample_rate: float, is_real: bool) -> np.ndarray:
+        """Get the (read-only) frequency axis, rebuilding it only when N or fs change"""
+        key = (n_fft, sample_rate, is_real)
+        if self._freq_cache is not None and self._freq_cache[0] == key:
+            return self._freq_cache[1]
+
+        if is_real:
+            freqs = rfftfreq(n_fft, 1/sample_rate)
+        else:
+            freqs = fftshift(fftfreq(n_fft, 1/sample_rate))
+        freqs.flags.writeable = False
+        self._freq_cache = (key, freqs)
+        return freqs
+
     def compute_psd(self, samples: np.ndarray,
                     sample_rate: float) -> Tuple[np.ndarray, np.ndarray]:
         """Compute Power Spectral Density"""
+        # Work in single precision: complex64 IQ, float32 for real input
+        samples = _as_iq(samples)
+        is_real = np.isrealobj(samples)
+
         # Ensure we have the right number of samples
         num_samples = len(samples)
 
         # Regenerate window if sample size changed
         if num_samples != len(self.window):
             self.window = self._get_window(self.window_type, num_samples)
-            self.fft_size = num_samples
 
-        # Apply window
-        windowed = samples * self.window
+        # Zero-pad to a 2/3/5-smooth length so pocketfft stays on fast radices
+        n_fft = next_fast_len(num_samples, real=is_real)
+        self.fft_size = n_fft
+
+        # Apply window into the reusable buffer, zero-padding the tail
+        buf = self._get_fft_buffer(n_fft, np.result_type(samples, self.window))
+        np.multiply(samples, self.window, out=buf[:num_samples])
+        buf[num_samples:] = 0
 
-        # Compute FFT
-        spectrum = fftshift(fft(windowed))
+        # Compute FFT (buffer is rewritten every call, so pocketfft may clobber it)
+        with _fft_backend():
+            if is_real:
+                # Real input has a Hermitian spectrum - only N/2+1 bins are needed
+                spectrum = rfft(buf, workers=self._fft_workers, overwrite_x=True)
+            else:
+                spectrum = fft(buf, workers=self._fft_workers, overwrite_x=True)
+        # Optional backends may promote to complex128; the float32 view needs complex64
+        if spectrum.dtype != np.complex64:
+            spectrum = spectrum.astype(np.complex64)
+        freqs = self._get_freqs(n_fft, sample_rate, is_real)
 
-        # Compute power in dB
-        power = np.abs(spectrum) ** 2
-        power_db = 10 * np.log10(power + 1e-10)
+        # Compute power in dB (|X|^2 without the sqrt in np.abs), then
+        # normalize for window power - all in place on one output array.
+        # Squaring the interleaved re/im floats in place needs no temporaries;
+        # the spectrum is scratch at this point
+        parts = spectrum.view(np.float32)
+        np.square(parts, out=parts)
+        if is_real:
+            power_db = np.add(parts[0::2], parts[1::2])
+        else:
+            # Write the two halves straight into fftshift order instead of
+            # shifting a copy of the complex spectrum first
+            split = (n_fft + 1) // 2
+            power_db = np.empty(n_fft, dtype=np.float32)
+            np.add(parts[2 * split::2], parts[2 * split + 1::2],
+                   out=power_db[:n_fft - split])
+            np.add(parts[0:2 * split:2], parts[1:2 * split:2],
+                   out=power_db[n_fft - split:])
+        power_db += np.float32(1e-10)
+        np.log10(power_db, out=power_db)
+        power_db *= np.float32(10)
+        power_db -= self._win_db
+
+        return freqs, power_db
 
-        # Normalize for window power
-        window_power = np.sum(self.window ** 2)
-        power_db -= 10 * np.log10(window_power)
+    def compute_welch(self, samples: np.ndarray,
+                      sample_rate: float,
+                      nperseg: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute averaged PSD over a long capture using Welch's method.
 
-        # Generate frequency array
-        freqs = fftshift(fftfreq(self.fft_size, 1/sample_rate))
+        Output is scaled like compute_psd (window-power normalized dB), so
+        detection thresholds behave the same on either path. A 2D array of
+        equal-length captures is processed in one call, one PSD per row.
+        """
+        samples = _as_iq(samples)
+        is_real = np.isrealobj(samples)
+
+        nperseg = min(nperseg or self.fft_size, samples.shape[-1])
+        # welch has no workers argument; set the scipy.fft default around it only
+        with _fft_backend(), set_workers(self._fft_workers):
+            freqs, psd = signal.welch(
+                samples,
+                fs=sample_rate,
+                window=self._get_window(self.window_type, nperseg),
+                nperseg=nperseg,
+                noverlap=int(nperseg * self.overlap),
+                detrend=False,
+                return_onesided=is_real,
+                scaling='density',
+                axis=-1,
+            )
 
+        # density * fs == |X|^2 / sum(w^2), the compute_psd normalization
+        psd *= sample_rate
+        if is_real:
+            # Undo the one-sided doubling so bins match rfft power
+            psd[..., 1:] *= 0.5
+            if nperseg % 2 == 0:
+                psd[..., -1] *= 2
+        else:
+            freqs = fftshift(freqs)
+            psd = fftshift(psd, axes=-1)
+
+        # dB conversion in place on a float32 array, as in compute_psd
+        power_db = psd.astype(np.float32, copy=False)
+        power_db += np.float32(1e-10)
+        np.log10(power_db, out=power_db)
+        power_db *= np.float32(10)
         return freqs, power_db
         
     def update_averaging(self, power_db: np.ndarray):
         """Update averaged spectrum and peak hold"""
         # Reset averaging buffers if size changed
         if self.averaged_spectrum is None or len(self.averaged_spectrum) != len(power_db):
-            self.averaged_spectrum = power_db.copy()
-            self.peak_hold = power_db.copy()
+            self.averaged_spectrum = np.array(power_db, dtype=np.float32)
+            self.peak_hold = self.averaged_spectrum.copy()
         else:
-            # Exponential averaging
-            self.averaged_spectrum = (self.averaging_alpha * power_db + 
-                                     (1 - self.averaging_alpha) * self.averaged_spectrum)
+            # Exponential averaging (in place, float32)
+            self.averaged_spectrum *= np.float32(1 - self.averaging_alpha)
+            self.averaged_spectrum += np.float32(self.averaging_alpha) * power_db
             # Peak hold
-            self.peak_hold = np.maximum(self.peak_hold, power_db)
+            np.maximum(self.peak_hold, power_db, out=self.peak_hold)
             
     def estimate_noise_floor(self, power_db: np.ndarray, 
                            percentile: float = 20) -> float:
         """Estimate noise floor using percentile method"""
-        return np.percentile(power_db, percentile)
+        # Select the two bracketing order statistics in O(N) and interpolate
+        # linearly, matching np.percentile without its per-call overhead
+        pos = (power_db.size - 1) * percentile / 100.0
+        lo = int(pos)
+        hi = min(lo + 1, power_db.size - 1)
+
+        # Partition a reused scratch copy in place rather than allocating one
+        if self._nf_scratch.size < power_db.size or self._nf_scratch.dtype != power_db.dtype:
+            self._nf_scratch = np.empty(power_db.size, dtype=power_db.dtype)
+        part = self._nf_scratch[:power_db.size]
+        np.copyto(part, power_db)
+        part.partition((lo, hi))
+        return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
         
     def detect_signals(self, freqs: np.ndarray, 
                       power_db: np.ndarray,
-                      center_freq: float) -> List[Signal]:
+                      center_freq: float,
+                      noise_floor: Optional[float] = None) -> List[Signal]:
         """Detect signals in spectrum"""
-        signals = []
-        
-        # Estimate noise floor
-        noise_floor = self.estimate_noise_floor(power_db)
+        return self.detect_signal_batch(freqs, power_db, center_freq, noise_floor).to_signals()
+
+    def detect_signal_batch(self, freqs: np.ndarray,
+                            power_db: np.ndarray,
+                            center_freq: float,
+                            noise_floor: Optional[float] = None) -> SignalBatch:
+        """Detect signals in spectrum, returned as parallel arrays"""
+        # Estimate noise floor unless the caller already has it
+        if noise_floor is None:
+            noise_floor = self.estimate_noise_floor(power_db)
         threshold = noise_floor + self.signal_threshold_db
         
         # Find peaks
@@ -145,114 +519,137 @@ class SpectrumAnalyzer:
             distance=10,  # Minimum distance between peaks
             prominence=6   # Minimum prominence
         )
-        
-        # Analyze each peak
-        for idx in peaks:
-            # Estimate bandwidth (3dB down points)
-            peak_power = power_db[idx]
-            freq = center_freq + freqs[idx]
-            
-            # Find 3dB bandwidth
-            left_idx = idx
-            right_idx = idx
-            cutoff = peak_power - 3
-            
-            while left_idx > 0 and power_db[left_idx] > cutoff:
-                left_idx -= 1
-            while right_idx < len(power_db)-1 and power_db[right_idx] > cutoff:
-                right_idx += 1
-                
-            bandwidth = freqs[right_idx] - freqs[left_idx]
-            snr = peak_power - noise_floor
-            
+
+        # Estimate bandwidth (3dB down points) for all peaks at once. Fixing
+        # each peak's "prominence" at 3 dB over the whole spectrum makes
+        # peak_widths measure at peak - 3 dB, interpolated between bins
+        peak_power = power_db[peaks]
+        _, _, left_ips, right_ips = signal.peak_widths(
+            power_db, peaks, rel_height=1.0,
+            prominence_data=(np.full(len(peaks), 3.0),
+                             np.zeros(len(peaks), dtype=np.intp),
+                             np.full(len(peaks), len(power_db) - 1, dtype=np.intp))
+        )
+        bins = np.arange(len(freqs))
+        bandwidth = np.interp(right_ips, bins, freqs) - np.interp(left_ips, bins, freqs)
+        snr = peak_power - noise_floor
+
+        return SignalBatch(
+            frequency=center_freq + freqs[peaks],
+            power=peak_power,
+            bandwidth=bandwidth,
+            snr=snr,
             # Basic modulation hint based on bandwidth
-            modulation_hint = self._guess_modulation(bandwidth, snr)
-            
-            signals.append(Signal(
-                frequency=freq,
-                power=peak_power,
-                bandwidth=bandwidth,
-                snr=snr,
-                modulation_hint=modulation_hint,
-                confidence=min(snr / 30, 1.0)  # Confidence based on SNR
-            ))
-            
-        return signals
-        
+            modulation_hint=self._guess_modulations(bandwidth),
+            confidence=np.minimum(snr / 30, 1.0)  # Confidence based on SNR
+        )
+
+    # Bandwidth buckets for the modulation heuristic: label i covers
+    # _MOD_EDGES[i-1] <= bandwidth < _MOD_EDGES[i]
+    _MOD_EDGES = np.array([200, 3000, 10000, 200000], dtype=float)
+    _MOD_LABELS = (
+        "CW",          # Very narrow
+        "NFM",         # Narrow
+        "AM/NFM",      # Medium
+        "WFM",         # Wide
+        "Digital/TV",  # Very wide
+    )
+
     def _guess_modulation(self, bandwidth: float, snr: float) -> str:
         """Guess modulation type based on bandwidth and SNR"""
+        return self._guess_modulations(np.array([bandwidth]))[0]
+
+    def _guess_modulations(self, bandwidths: np.ndarray) -> List[str]:
+        """Guess modulation type for many bandwidths in one lookup"""
         # This is a simplified heuristic
-        if bandwidth < 200:  # Very narrow
-            return "CW"
-        elif bandwidth < 3000:  # Narrow
-            return "NFM"
-        elif bandwidth < 10000:  # Medium
-            return "AM/NFM"
-        elif bandwidth < 200000:  # Wide
-            return "WFM"
-        else:  # Very wide
-            return "Digital/TV"
+        buckets = np.searchsorted(self._MOD_EDGES, bandwidths, side='right')
+        return [self._MOD_LABELS[i] for i in buckets.tolist()]
             
     def identify_known_signals(self, signals: List[Signal], 
                              center_freq: float) -> List[Signal]:
         """Identify known signal types based on frequency"""
-        # Common frequencies and their uses
-        known_signals = {
-            # Aviation
-            (108e6, 118e6): "Aviation AM",
-            (118e6, 137e6): "Aviation AM",
-            (1090e6, 1090e6): "ADS-B",
-            (978e6, 978e6): "UAT",
-            
-            # Marine
-            (156e6, 162e6): "Marine VHF",
-            (161.975e6, 162.025e6): "AIS",
-            
-            # Amateur Radio
-            (144e6, 148e6): "2m Amateur",
-            (430e6, 440e6): "70cm Amateur",
-            (14e6, 14.35e6): "20m Amateur",
-            
-            # Broadcast
-            (88e6, 108e6): "FM Broadcast",
-            (535e3, 1705e3): "AM Broadcast",
-            
-            # Emergency
-            (150.8e6, 162.5e6): "Public Safety",
-            
-            # ISM
-            (433.05e6, 434.79e6): "ISM 433",
-            (902e6, 928e6): "ISM 900",
-            (2.4e9, 2.5e9): "ISM 2.4G",
-        }
-        
-        for sig in signals:
-            for (low, high), description in known_signals.items():
-                if low <= sig.frequency <= high:
-                    sig.modulation_hint = f"{sig.modulation_hint or ''} ({description})"
-                    sig.confidence = min(sig.confidence + 0.2, 1.0)
-                    break
+        if not signals:
+            return signals
+
+        freqs = np.fromiter((sig.frequency for sig in signals), dtype=float,
+                            count=len(signals))
+        for sig, description in zip(signals, _known_band_labels(freqs)):
+            if description is not None:
+                sig.modulation_hint = f"{sig.modulation_hint or ''} ({description})"
+                sig.confidence = min(sig.confidence + 0.2, 1.0)
                     
         return signals
+
+    def identify_known_signal_batch(self, batch: SignalBatch) -> SignalBatch:
+        """Identify known signal types for a batch, updating it in place"""
+        if not len(batch):
+            return batch
+
+        labels = _known_band_labels(batch.frequency)
+        known = np.fromiter((label is not None for label in labels), dtype=bool,
+                            count=len(labels))
+        batch.modulation_hint = [
+            f"{hint or ''} ({label})" if label is not None else hint
+            for hint, label in zip(batch.modulation_hint, labels)
+        ]
+        batch.confidence = np.minimum(batch.confidence + 0.2 * known, 1.0)
+        return batch
         
     async def analyze_spectrum(self, samples: np.ndarray,
                              sample_rate: float,
-                             center_freq: float) -> SpectrumFrame:
+                             center_freq: float,
+                             use_welch: bool = False) -> SpectrumFrame:
         """Perform complete spectrum analysis"""
-        # Compute PSD
-        freqs, power_db = self.compute_psd(samples, sample_rate)
-        
+        samples = _as_iq(samples)
+
+        # Compute PSD (Welch averages many segments of a long capture)
+        if use_welch:
+            freqs, power_db = self.compute_welch(samples, sample_rate)
+        else:
+            freqs, power_db = self.compute_psd(samples, sample_rate)
+
+        return self._build_frame(freqs, power_db, sample_rate, center_freq)
+
+    async def analyze_spectrum_batch(self, captures: List[np.ndarray],
+                                     sample_rate: float,
+                                     center_freqs: List[float],
+                                     nperseg: Optional[int] = None) -> List[SpectrumFrame]:
+        """Analyze several captures with Welch, batching equal-length ones"""
+        return self._analyze_batch(captures, sample_rate, center_freqs, nperseg)
+
+    def _analyze_batch(self, captures: List[np.ndarray],
+                       sample_rate: float,
+                       center_freqs: List[float],
+                       nperseg: Optional[int] = None) -> List[SpectrumFrame]:
+        """Synchronous body of analyze_spectrum_batch (safe to run in a worker thread)"""
+        if len({len(c) for c in captures}) == 1:
+            freqs, power_rows = self.compute_welch(np.stack(captures), sample_rate, nperseg)
+            return [self._build_frame(freqs, power_db, sample_rate, center_freq)
+                    for power_db, center_freq in zip(power_rows, center_freqs)]
+
+        frames = []
+        for capture, center_freq in zip(captures, center_freqs):
+            freqs, power_db = self.compute_welch(capture, sample_rate, nperseg)
+            frames.append(self._build_frame(freqs, power_db, sample_rate, center_freq))
+        return frames
+
+    def _build_frame(self, freqs: np.ndarray,
+                     power_db: np.ndarray,
+                     sample_rate: float,
+                     center_freq: float) -> SpectrumFrame:
+        """Run detection on a computed PSD and update averaging/waterfall"""
         # Update averaging
         self.update_averaging(power_db)
         
         # Detect signals
-        signals = self.detect_signals(freqs, power_db, center_freq)
+        noise_floor = self.estimate_noise_floor(power_db)
+        batch = self.detect_signal_batch(freqs, power_db, center_freq, noise_floor)
         
         # Identify known signals
-        signals = self.identify_known_signals(signals, center_freq)
+        batch = self.identify_known_signal_batch(batch)
         
         # Update waterfall
-        self.waterfall_history.append(power_db)
+        self._append_waterfall(power_db)
         
         # Create frame
         frame = SpectrumFrame(
@@ -262,21 +659,41 @@ class SpectrumAnalyzer:
             frequencies=center_freq + freqs,
             power_db=power_db,
             peak_power=np.max(power_db),
-            noise_floor=self.estimate_noise_floor(power_db),
-            detected_signals=signals
+            noise_floor=noise_floor,
+            detected_signals=batch.to_signals()
         )
         
         return frame
         
-    def get_waterfall_data(self, num_lines: Optional[int] = None) -> np.ndarray:
-        """Get waterfall display data"""
-        if not self.waterfall_history:
-            return np.array([])
-            
-        data = np.array(list(self.waterfall_history))
-        if num_lines and len(data) > num_lines:
-            return data[-num_lines:]
-        return data
+    def _append_waterfall(self, power_db: np.ndarray):
+        """Push a spectrum line into the waterfall, cascading pair-averages"""
+        line = power_db
+        for level, ring in enumerate(self._waterfall):
+            ring.append(line)
+            if level + 1 == len(self._waterfall):
+                break
+
+            # Every second line at this level produces one line a level up
+            carry = self._waterfall_carry[level]
+            if carry is None or len(carry) != len(line):
+                self._waterfall_carry[level] = np.array(line, dtype=np.float32)
+                break
+            carry += line
+            carry *= np.float32(0.5)
+            line = carry
+            self._waterfall_carry[level] = None
+
+    def get_waterfall_data(self, num_lines: Optional[int] = None,
+                           level: int = 0) -> np.ndarray:
+        """Get waterfall display data, oldest line first.
+
+        Level 0 is full rate; level k lines each average 2**k frames. When
+        the requested lines are contiguous in the ring the result is a view,
+        so copy it if it must outlive the next analyzed frame.
+        """
+        if not 0 <= level < len(self._waterfall):
+            raise ValueError(f"Waterfall level must be 0-{len(self._waterfall) - 1}, got {level}")
+        return self._waterfall[level].latest(num_lines)
         
     def reset_averaging(self):
         """Reset averaging buffers"""
@@ -288,9 +705,33 @@ class SpectrumAnalyzer:
         if self.averaged_spectrum is not None:
             self.peak_hold = self.averaged_spectrum.copy()
 
+def _write_buffers(fd: int, buffers: List[np.ndarray]):
+    """Write buffers to fd in order, batching with writev where available"""
+    views = [memoryview(b).cast('B') for b in buffers if b.nbytes]
+    if not hasattr(os, "writev"):
+        for view in views:
+            while view:
+                view = view[os.write(fd, view):]
+        return
+
+    start = 0
+    while start < len(views):
+        written = os.writev(fd, views[start:start + SignalRecorder.IOV_MAX])
+        # Step past fully written buffers and trim a partially written one
+        while written:
+            if written >= len(views[start]):
+                written -= len(views[start])
+                start += 1
+            else:
+                views[start] = views[start][written:]
+                written = 0
+
 class SignalRecorder:
     """Record IQ samples and spectrum data"""
 
+    FLUSH_BYTES = 1 << 20  # Queue this much IQ before a writev flush
+    IOV_MAX = 1024         # Buffers per writev call (POSIX minimum limit)
+
     def __init__(self, base_path: str = None):
         # Use /tmp/sdr_recordings as default - always writable
         if base_path is None:
@@ -298,6 +739,11 @@ class SignalRecorder:
         self.base_path = base_path
         self.current_recording = None
         self.recording_metadata = {}
+
+        # Captures waiting to be written, and the flush currently in a thread
+        self._pending: List[np.ndarray] = []
+        self._pending_bytes = 0
+        self._flush_future: Optional[asyncio.Future] = None
         
     async def start_recording(self, 
                             center_freq: float,
@@ -318,30 +764,60 @@ class SignalRecorder:
             "samples_recorded": 0
         }
 
-        # Create recording file
+        # Create recording file (unbuffered - writes are batched by _flush)
         os.makedirs(self.base_path, exist_ok=True)
         self.current_recording = open(
             f"{self.base_path}/{recording_id}.iq", 
-            "wb"
+            "wb",
+            buffering=0
         )
+        self._pending = []
+        self._pending_bytes = 0
         
         return recording_id
         
     async def add_samples(self, samples: np.ndarray):
         """Add samples to current recording"""
         if self.current_recording:
-            # Convert to interleaved I/Q format
-            iq_data = np.empty(len(samples) * 2, dtype=np.float32)
-            iq_data[0::2] = samples.real
-            iq_data[1::2] = samples.imag
+            # complex64 is already interleaved float32 I/Q in memory
+            iq_data = _as_iq(samples)
+            if iq_data.dtype != np.complex64:
+                iq_data = iq_data.astype(np.complex64)
+            elif np.may_share_memory(iq_data, samples):
+                # Queued until the flush, so don't hold the caller's buffer
+                # (SDRDevice.capture/stream recycle theirs)
+                iq_data = iq_data.copy()
             
-            # Write to file
-            iq_data.tofile(self.current_recording)
-            self.recording_metadata["samples_recorded"] += len(samples)
+            # Queue for a batched write off the event loop
+            self._pending.append(iq_data)
+            self._pending_bytes += iq_data.nbytes
+            self.recording_metadata["samples_recorded"] += iq_data.size
+
+            if self._pending_bytes >= self.FLUSH_BYTES:
+                await self._flush()
+
+    async def _flush(self):
+        """Write all queued captures with one writev batch in a worker thread"""
+        # Keep writes ordered: wait for any flush a cancelled caller left behind
+        if self._flush_future is not None:
+            await self._flush_future
+            self._flush_future = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self._pending_bytes = 0
+        self._flush_future = asyncio.ensure_future(asyncio.to_thread(
+            _write_buffers, self.current_recording.fileno(), batch))
+        # Shield so cancelling the recording task doesn't orphan a half-done write
+        await asyncio.shield(self._flush_future)
+        self._flush_future = None
             
     async def stop_recording(self) -> Dict[str, Any]:
         """Stop current recording"""
         if self.current_recording:
+            await self._flush()
             self.current_recording.close()
             self.current_recording = None
             
@@ -364,9 +840,19 @@ class SignalRecorder:
 class FrequencyScanner:
     """Scan frequency ranges for signals"""
     
-    def __init__(self, analyzer: SpectrumAnalyzer):
+    def __init__(self, analyzer: SpectrumAnalyzer, batch_size: int = 4,
+                 fft_size: Optional[int] = None):
         self.analyzer = analyzer
+        self.batch_size = batch_size
+        # Welch segment length for scans, pinned to the configured size
+        # (compute_psd rewrites analyzer.fft_size to its padded length)
+        self.fft_size = fft_size or analyzer.fft_size
         self.scan_results = []
+
+        # Summary aggregates, maintained as results are stored
+        self._signal_count = 0
+        self._signal_types: Counter = Counter()
+        self._strongest: Optional[Dict[str, Any]] = None
         
     async def scan_range(self, 
                         sdr_device,
@@ -374,139 +860,194 @@ class FrequencyScanner:
                         stop_freq: float,
                         step: float,
                         dwell_time: float = 0.1) -> List[Dict[str, Any]]:
-        """Scan a frequency range"""
+        """Scan a frequency range.
+
+        Tuning and capture of the next steps run while earlier captures are
+        analyzed. Captures that queue up while analysis is busy (up to
+        batch_size) are analyzed together in one batched Welch call.
+        """
         self.scan_results = []
-        
-        current_freq = start_freq
-        while current_freq <= stop_freq:
-            # Tune to frequency
-            await sdr_device.set_frequency(current_freq)
-            await asyncio.sleep(0.05)  # Settling time
-            
-            # Capture samples
-            num_samples = int(sdr_device.sample_rate * dwell_time)
-            samples = await sdr_device.read_samples(num_samples)
-            
-            # Analyze
-            frame = await self.analyzer.analyze_spectrum(
-                samples, 
-                sdr_device.sample_rate,
-                current_freq
-            )
-            
-            # Store results
-            if frame.detected_signals:
-                self.scan_results.append({
-                    "frequency": current_freq,
-                    "timestamp": frame.timestamp.isoformat(),
-                    "signals": [
-                        {
-                            "frequency": sig.frequency,
-                            "power": sig.power,
-                            "bandwidth": sig.bandwidth,
-                            "snr": sig.snr,
-                            "type": sig.modulation_hint
-                        }
-                        for sig in frame.detected_signals
-                    ]
-                })
+        self._signal_count = 0
+        self._signal_types = Counter()
+        self._strongest = None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size)
+
+        # One segment size for the whole scan so every step shares one
+        # cached window and frequency axis, and captures stay batchable
+        n_fft = self.fft_size
+
+        async def produce():
+            try:
+                current_freq = start_freq
+                while current_freq <= stop_freq:
+                    # Tune to frequency
+                    await sdr_device.set_frequency(current_freq)
+                    await asyncio.sleep(0.05)  # Settling time
+
+                    # Capture samples
+                    num_samples = int(sdr_device.sample_rate * dwell_time)
+                    samples = await sdr_device.read_samples(num_samples)
+                    samples = self._fit_capture(samples, n_fft)
+                    await queue.put((current_freq, samples))
+
+                    current_freq += step
+            except Exception as e:
+                # Hand capture errors to the consumer to re-raise
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            done = False
+            while not done:
+                batch = [await queue.get()]
+                while len(batch) < self.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                # The end-of-scan marker (or an error) is always last
+                if batch[-1] is None or isinstance(batch[-1], Exception):
+                    end = batch.pop()
+                    if end is not None:
+                        raise end
+                    done = True
+                if not batch:
+                    continue
+
+                # Analyze in a worker thread so the producer keeps retuning
+                # and capturing while the FFT work runs
+                frames = await asyncio.to_thread(
+                    self.analyzer._analyze_batch,
+                    [samples for _, samples in batch],
+                    sdr_device.sample_rate,
+                    [current_freq for current_freq, _ in batch],
+                    n_fft
+                )
                 
-            current_freq += step
+                # Store results
+                for (current_freq, _), frame in zip(batch, frames):
+                    if frame.detected_signals:
+                        signals = [
+                            {
+                                "frequency": sig.frequency,
+                                "power": sig.power,
+                                "bandwidth": sig.bandwidth,
+                                "snr": sig.snr,
+                                "type": sig.modulation_hint
+                            }
+                            for sig in frame.detected_signals
+                        ]
+                        self.scan_results.append({
+                            "frequency": current_freq,
+                            "timestamp": frame.timestamp.isoformat(),
+                            "signals": signals
+                        })
+                        self._update_summary(signals)
+        finally:
+            producer.cancel()
             
         return self.scan_results
         
+    def _fit_capture(self, samples: np.ndarray, n_fft: int) -> np.ndarray:
+        """Trim a capture to whole Welch segments, zero-padding short reads to one"""
+        if len(samples) < n_fft:
+            return np.concatenate((samples, np.zeros(n_fft - len(samples), dtype=samples.dtype)))
+
+        # Welch ignores a trailing partial segment anyway; dropping it keeps
+        # captures from the same dwell time equal length for batching
+        hop = max(1, n_fft - int(n_fft * self.analyzer.overlap))
+        return samples[:n_fft + (len(samples) - n_fft) // hop * hop]
+
+    def _update_summary(self, signals: List[Dict[str, Any]]):
+        """Fold one scan point's signals into the running summary"""
+        self._signal_count += len(signals)
+        self._signal_types.update(sig.get("type", "Unknown") for sig in signals)
+
+        # Strictly greater keeps the first of equal-power signals
+        max_power = self._strongest["power"] if self._strongest else -200
+        for sig in signals:
+            if sig["power"] > max_power:
+                max_power = sig["power"]
+                self._strongest = sig
+
     def get_activity_summary(self) -> Dict[str, Any]:
         """Get summary of scan results"""
         if not self.scan_results:
             return {"message": "No scan data available"}
-            
-        total_signals = sum(len(r["signals"]) for r in self.scan_results)
-        
-        # Group by signal type
-        signal_types = {}
-        for result in self.scan_results:
-            for sig in result["signals"]:
-                sig_type = sig.get("type", "Unknown")
-                if sig_type not in signal_types:
-                    signal_types[sig_type] = 0
-                signal_types[sig_type] += 1
                 
         return {
             "scan_points": len(self.scan_results),
-            "total_signals": total_signals,
-            "signal_types": signal_types,
+            "total_signals": self._signal_count,
+            "signal_types": dict(self._signal_types),
             "strongest_signal": self._find_strongest_signal()
         }
         
     def _find_strongest_signal(self) -> Optional[Dict[str, Any]]:
         """Find the strongest signal from scan"""
-        strongest = None
-        max_power = -200
-
-        for result in self.scan_results:
-            for sig in result["signals"]:
-                if sig["power"] > max_power:
-                    max_power = sig["power"]
-                    strongest = sig
-
-        return strongest
+        return self._strongest
 
 class AudioRecorder:
     """Record demodulated audio from FM/AM signals"""
 
+    # AM DC-blocking high-pass filter
+    DC_ALPHA = 0.95
+    _DC_B = np.array([DC_ALPHA, -DC_ALPHA])
+    _DC_A = np.array([1.0, -DC_ALPHA])
+
     def __init__(self, base_path: str = None):
         # Use /tmp/sdr_recordings as default - always writable
         if base_path is None:
             base_path = "/tmp/sdr_recordings"
         self.base_path = base_path
         self.current_recording = None
+        self._wav_file = None
         self.recording_metadata = {}
         self.audio_rate = 48000  # Standard audio sample rate
 
         # For smooth audio - track previous samples for continuity
-        self.last_phase = 0.0
-        self.dc_filter_state = 0.0
+        self._last_sample: Optional[complex] = None
+
+        # IIR filter state carried across chunks (None = start of stream)
+        self._dc_zi: Optional[np.ndarray] = None
+        self._deemph_zi: Optional[np.ndarray] = None
+        self._deemph_coeffs: Optional[Tuple[Tuple[float, float], np.ndarray, np.ndarray]] = None
 
         # AGC (Automatic Gain Control) instead of per-chunk normalization
         self.agc_gain = 0.1
         self.agc_target = 0.3  # Target RMS level (leave headroom)
+        self._power_ema: Optional[float] = None
 
-    def _fm_demodulate(self, samples: np.ndarray) -> np.ndarray:
-        """FM demodulation using phase difference with continuity"""
-        # Calculate instantaneous phase
-        phase = np.unwrap(np.angle(samples))
-
-        # Use last phase from previous chunk for continuity
-        if self.last_phase != 0.0:
-            # Adjust phase to be continuous with previous chunk
-            phase_offset = self.last_phase - phase[0]
-            phase = phase + phase_offset
-
-        # Store last phase for next chunk
-        self.last_phase = phase[-1]
+        # Polyphase resampling filters, keyed by (input rate, output rate)
+        self._resamplers: Dict[Tuple[float, float], Tuple[int, int, np.ndarray]] = {}
 
-        # Phase difference (derivative) - this is the demodulated signal
-        phase_diff = np.diff(phase)
+        # Scratch buffer for int16 PCM conversion, grown as needed
+        self._pcm_scratch = np.empty(0, dtype=np.int16)
 
-        # Pad to maintain same length
-        phase_diff = np.append(phase_diff, phase_diff[-1])
+    def _fm_demodulate(self, samples: np.ndarray) -> np.ndarray:
+        """FM demodulation using phase difference with continuity"""
+        # Discriminator: the angle of x[n] * conj(x[n-1]) is the wrapped
+        # phase step, so no unwrap is needed. The first product uses the
+        # previous chunk's last sample to stay continuous across chunks
+        prev = samples[0] if self._last_sample is None else self._last_sample
+        prod = np.empty_like(samples)
+        prod[0] = samples[0] * np.conj(prev)
+        np.multiply(samples[1:], np.conj(samples[:-1]), out=prod[1:])
+        self._last_sample = samples[-1]
 
-        return phase_diff
+        return np.angle(prod)
 
     def _am_demodulate(self, samples: np.ndarray) -> np.ndarray:
         """AM demodulation using envelope detection with DC filter"""
         # Calculate envelope (magnitude)
         envelope = np.abs(samples)
 
-        # High-pass filter to remove DC (continuous across chunks)
-        alpha = 0.95  # Filter coefficient
-        filtered = np.zeros_like(envelope)
-        filtered[0] = envelope[0] - self.dc_filter_state
-
-        for i in range(1, len(envelope)):
-            filtered[i] = alpha * (filtered[i-1] + envelope[i] - envelope[i-1])
-
-        self.dc_filter_state = envelope[-1]
+        # High-pass filter to remove DC (continuous across chunks):
+        # y[n] = alpha * (y[n-1] + x[n] - x[n-1])
+        if self._dc_zi is None:
+            # Start of stream: seed so that y[0] = x[0]
+            self._dc_zi = np.array([(1 - self.DC_ALPHA) * envelope[0]])
+        filtered, self._dc_zi = signal.lfilter(self._DC_B, self._DC_A, envelope,
+                                               zi=self._dc_zi)
 
         return filtered
 
@@ -517,19 +1058,34 @@ class AudioRecorder:
         if original_rate == target_rate:
             return audio
 
-        # Use scipy's resample_poly for better quality (less artifacts)
-        from scipy.signal import resample_poly
+        up, down, fir = self._get_resampler(original_rate, target_rate)
+
+        # Resample using polyphase filtering (scipy's resample_poly for better
+        # quality, less artifacts) in single precision with the cached FIR
+        return signal.resample_poly(audio.astype(np.float32, copy=False), up, down,
+                                    window=fir)
 
-        # Find greatest common divisor for efficient resampling
-        from math import gcd
-        ratio_num = int(target_rate)
-        ratio_den = int(original_rate)
-        common = gcd(ratio_num, ratio_den)
-        up = ratio_num // common
-        down = ratio_den // common
+    def _get_resampler(self, original_rate: float,
+                       target_rate: float) -> Tuple[int, int, np.ndarray]:
+        """Get (up, down, FIR) for a rate pair, designing the filter only once"""
+        key = (original_rate, target_rate)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            # Find greatest common divisor for efficient resampling
+            ratio_num = int(target_rate)
+            ratio_den = int(original_rate)
+            common = math.gcd(ratio_num, ratio_den)
+            up = ratio_num // common
+            down = ratio_den // common
 
-        # Resample using polyphase filtering
-        return resample_poly(audio, up, down)
+            # Same low-pass resample_poly designs by default; it applies the
+            # gain of `up` itself, so the taps are stored unscaled
+            max_rate = max(up, down)
+            fir = signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate,
+                                window=('kaiser', 5.0)).astype(np.float32)
+            resampler = (up, down, fir)
+            self._resamplers[key] = resampler
+        return resampler
 
     def _apply_deemphasis(self, audio: np.ndarray,
                           sample_rate: float,
@@ -538,18 +1094,25 @@ class AudioRecorder:
         # De-emphasis filter time constant
         # H(s) = 1 / (1 + s*tau)
 
-        d = sample_rate * tau
-        x = np.exp(-1.0 / d)
+        b, a = self._get_deemphasis_coeffs(sample_rate, tau)
 
-        # Simple IIR filter
-        output = np.zeros_like(audio)
-        output[0] = audio[0]
-
-        for i in range(1, len(audio)):
-            output[i] = audio[i] * (1 - x) + output[i-1] * x
+        # Simple IIR filter: y[n] = (1-x)*audio[n] + x*y[n-1], continuous across
+        # chunks; the first chunk is seeded so that y[0] = audio[0]
+        if self._deemph_zi is None:
+            self._deemph_zi = -a[1:] * audio[0]
+        output, self._deemph_zi = signal.lfilter(b, a, audio, zi=self._deemph_zi)
 
         return output
 
+    def _get_deemphasis_coeffs(self, sample_rate: float,
+                               tau: float = 75e-6) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (b, a) for the de-emphasis filter, rebuilt only when rate/tau change"""
+        key = (sample_rate, tau)
+        if self._deemph_coeffs is None or self._deemph_coeffs[0] != key:
+            x = np.exp(-1.0 / (sample_rate * tau))
+            self._deemph_coeffs = (key, np.array([1 - x]), np.array([1.0, -x]))
+        return self._deemph_coeffs[1], self._deemph_coeffs[2]
+
     async def start_recording(self,
                               center_freq: float,
                               sample_rate: float,
@@ -560,9 +1123,16 @@ class AudioRecorder:
         recording_id = f"audio_{timestamp}_{int(center_freq/1e6)}MHz_{modulation}"
 
         # Reset state variables for new recording
-        self.last_phase = 0.0
-        self.dc_filter_state = 0.0
+        self._last_sample = None
+        self._dc_zi = None
+        self._deemph_zi = None
         self.agc_gain = 0.1
+        self._power_ema = None
+
+        # Precompute de-emphasis and resampling filters for this stream
+        self._get_deemphasis_coeffs(sample_rate)
+        if sample_rate != self.audio_rate:
+            self._get_resampler(sample_rate, self.audio_rate)
 
         self.recording_metadata = {
             "id": recording_id,
@@ -578,9 +1148,11 @@ class AudioRecorder:
         # Create recording directory
         os.makedirs(self.base_path, exist_ok=True)
 
-        # Create WAV file
+        # Create WAV file on a large buffered file; the header's sizes are
+        # patched once when the recording is closed
         wav_path = f"{self.base_path}/{recording_id}.wav"
-        self.current_recording = wave.open(wav_path, 'wb')
+        self._wav_file = open(wav_path, 'wb', buffering=1 << 20)
+        self.current_recording = wave.open(self._wav_file, 'wb')
         self.current_recording.setnchannels(1)  # Mono
         self.current_recording.setsampwidth(2)  # 16-bit
         self.current_recording.setframerate(self.audio_rate)
@@ -610,35 +1182,46 @@ class AudioRecorder:
 
         # Apply AGC (Automatic Gain Control) for smooth volume
         if len(audio) > 0:
-            # Calculate RMS level
-            rms = np.sqrt(np.mean(audio ** 2))
-
-            # Update gain smoothly
-            if rms > 0:
-                target_gain = self.agc_target / rms
-                # Smooth gain changes to avoid artifacts
-                self.agc_gain = 0.9 * self.agc_gain + 0.1 * target_gain
+            # Track mean power with an EMA across chunks (single-pass dot
+            # product); the EMA smooths gain changes to avoid artifacts
+            chunk_power = float(np.dot(audio, audio)) / audio.size
+            if self._power_ema is None:
+                self._power_ema = chunk_power
+            else:
+                self._power_ema = 0.9 * self._power_ema + 0.1 * chunk_power
+
+            # Update gain from the smoothed RMS level
+            if self._power_ema > 0:
                 # Limit gain to prevent excessive amplification
-                self.agc_gain = min(self.agc_gain, 10.0)
+                self.agc_gain = min(self.agc_target / math.sqrt(self._power_ema), 10.0)
 
-            # Apply gain
-            audio = audio * self.agc_gain
+            # Apply gain (audio is a fresh per-chunk array, so work in place)
+            audio *= self.agc_gain
 
             # Soft clipping to prevent hard clipping artifacts
-            audio = np.tanh(audio)
+            np.tanh(audio, out=audio)
 
-        # Convert to 16-bit PCM
-        audio_int16 = (audio * 32767 * 0.9).astype(np.int16)  # 0.9 for headroom
+        # Convert to 16-bit PCM into a reused scratch buffer
+        audio *= 32767 * 0.9  # 0.9 for headroom
+        if self._pcm_scratch.size < audio.size:
+            self._pcm_scratch = np.empty(audio.size, dtype=np.int16)
+        audio_int16 = self._pcm_scratch[:audio.size]
+        np.copyto(audio_int16, audio, casting='unsafe')
 
-        # Write to WAV file
-        self.current_recording.writeframes(audio_int16.tobytes())
+        # Write to WAV file (raw: writeframes would seek back and rewrite
+        # the header on every chunk, flushing the buffer each time)
+        self.current_recording.writeframesraw(audio_int16)
         self.recording_metadata["samples_recorded"] += len(audio_int16)
 
     async def stop_recording(self) -> Dict[str, Any]:
         """Stop current audio recording"""
         if self.current_recording:
+            # wave patches the header sizes on close but leaves a caller-
+            # supplied file open
             self.current_recording.close()
             self.current_recording = None
+            self._wav_file.close()
+            self._wav_file = None
 
             # Save metadata
             self.recording_metadata["end_time"] = datetime.now().isoformat()
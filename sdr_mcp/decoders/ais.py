@@ -5,9 +5,10 @@ Decodes AIS messages on 161.975 MHz and 162.025 MHz
 
 import numpy as np
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,78 @@ logger = logging.getLogger(__name__)
 AIS_CHANNEL_A = 161.975e6
 AIS_CHANNEL_B = 162.025e6
 
-@dataclass
+
+def _build_sixbit_table() -> bytes:
+    """256-entry bytes.translate table mapping armored payload chars to 6-bit ASCII"""
+    table = bytearray(b'?' * 256)
+    for c in range(256):
+        val = c - 48
+        if val > 40:
+            val -= 8
+        if 0 <= val <= 63:
+            table[c] = val + 32
+    return bytes(table)
+
+
+_SIXBIT_TABLE = _build_sixbit_table()
+
+
+def _field(n: int, nbits: int, start: int, end: int, signed: bool = False) -> int:
+    """Extract bits [start, end) from an nbits-wide big-endian payload integer"""
+    width = end - start
+    value = (n >> (nbits - end)) & ((1 << width) - 1)
+    if signed and value >> (width - 1):
+        value -= 1 << width
+    return value
+
+
+def _field_text(n: int, nbits: int, start: int, end: int) -> Optional[str]:
+    """Decode a 6-bit ASCII text field ('@' padded) from a payload integer"""
+    chars = bytearray()
+    for pos in range(start, end, 6):
+        val = _field(n, nbits, pos, pos + 6)
+        chars.append(val if val >= 32 else val + 64)
+    text = chars.decode('ascii').rstrip('@ ')
+    return text or None
+
+
+# Position report layouts: (name, start bit, end bit, signed, divisor, not-available raw value).
+# Class A (types 1-3) and class B (types 18, 19) carry the same fields at different offsets
+_POSITION_BITS = 168
+_CLASS_A_POSITION = (
+    ('latitude', 89, 116, True, 600000.0, 0x3412140),   # 1/10000 minute
+    ('longitude', 61, 89, True, 600000.0, 0x6791AC0),
+    ('speed', 50, 60, False, 10.0, 1023),               # 1/10 knot
+    ('course', 116, 128, False, 10.0, 3600),            # 1/10 degree
+    ('heading', 128, 137, False, 1.0, 511),             # degrees
+)
+_CLASS_B_POSITION = (
+    ('latitude', 85, 112, True, 600000.0, 0x3412140),
+    ('longitude', 57, 85, True, 600000.0, 0x6791AC0),
+    ('speed', 46, 56, False, 10.0, 1023),
+    ('course', 112, 124, False, 10.0, 3600),
+    ('heading', 124, 133, False, 1.0, 511),
+)
+
+
+def _compile_layout(spec) -> tuple:
+    """Turn a field spec into constant (name, shift, mask, sign bit, divisor, n/a) rows"""
+    return tuple(
+        (name, _POSITION_BITS - end, (1 << (end - start)) - 1,
+         (1 << (end - start - 1)) if signed else 0, divisor, not_available)
+        for name, start, end, signed, divisor, not_available in spec
+    )
+
+
+_POSITION_LAYOUTS = {
+    1: _compile_layout(_CLASS_A_POSITION),
+    2: _compile_layout(_CLASS_A_POSITION),
+    3: _compile_layout(_CLASS_A_POSITION),
+    18: _compile_layout(_CLASS_B_POSITION),
+    19: _compile_layout(_CLASS_B_POSITION),
+}
+
+@dataclass(slots=True)
 class AISVessel:
     """Tracked vessel from AIS"""
     mmsi: str
@@ -31,7 +103,24 @@ class AISVessel:
     destination: Optional[str] = None
     eta: Optional[str] = None
     last_seen: datetime = None
+    last_seen_monotonic: float = 0.0  # time.monotonic() of last_seen, for age checks
     message_count: int = 0
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def update(self, **changes):
+        """Set fields and drop the cached dict (change vessels through this)"""
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self._dict_cache = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Public fields as a new dict, from a cache rebuilt after update()"""
+        if self._dict_cache is None:
+            self._dict_cache = {name: getattr(self, name) for name in _VESSEL_FIELDS}
+        return dict(self._dict_cache)
+
+
+_VESSEL_FIELDS = tuple(f.name for f in fields(AISVessel) if not f.name.startswith('_'))
 
 class AISDecoder:
     """AIS protocol decoder"""
@@ -65,73 +154,71 @@ class AISDecoder:
         self.vessels: Dict[str, AISVessel] = {}
         self.message_count = 0
 
+        # Ship type names indexed by the 8-bit type code
+        self._type_lut = tuple(self.SHIP_TYPES.get(code, f"Type {code}") for code in range(256))
+
+        # Column of last-seen monotonic times, one row per vessel in insertion
+        # order, so the active-vessel filter is a single vector compare
+        self._rows: List[AISVessel] = []
+        self._row_index: Dict[str, int] = {}
+        self._seen = np.zeros(64, dtype=np.float64)
+
     def decode_sixbit(self, data: str) -> str:
         """Decode AIS 6-bit ASCII payload"""
-        result = []
-        for char in data:
-            val = ord(char) - 48
-            if val > 40:
-                val -= 8
-            result.append(chr(val + 32) if 32 <= val + 32 <= 95 else '?')
-        return ''.join(result).strip('@')
-
-    def decode_position_report(self, mmsi: str, payload: bytes) -> Optional[Dict[str, Any]]:
-        """Decode AIS position report (message types 1, 2, 3)"""
-        if len(payload) < 17:
+        try:
+            raw = data.encode('latin-1')
+        except UnicodeEncodeError:
+            # Characters beyond latin-1 decode to '?' like any other invalid
+            # one; 0xFF is such a byte in the table
+            raw = bytes(c if c < 256 else 0xFF for c in map(ord, data))
+        return raw.translate(_SIXBIT_TABLE).decode('ascii').strip('@')
+
+    def decode_position_report(self, mmsi: str, payload: bytes,
+                               n: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Decode AIS position report (message types 1, 2, 3, 18, 19)"""
+        if len(payload) < 21:
             logger.debug(f"AIS position report payload too short: {len(payload)} bytes")
             return None
 
-        # Extract fields from payload
-        # This is a simplified decoder - real AIS needs proper bit extraction
-
-        # Latitude/Longitude (28 bits each, in 1/10000 minute)
-        lat_raw = int.from_bytes(payload[8:12], 'big') & 0x7FFFFFF
-        lon_raw = int.from_bytes(payload[12:16], 'big') & 0xFFFFFFF
-
-        latitude = (lat_raw / 600000.0) if lat_raw != 0x3412140 else None
-        longitude = (lon_raw / 600000.0) if lon_raw != 0x6791AC0 else None
-
-        # Speed over ground (10 bits, in 1/10 knot)
-        speed_raw = (int.from_bytes(payload[6:8], 'big') >> 6) & 0x3FF
-        speed = speed_raw / 10.0 if speed_raw != 1023 else None
-
-        # Course over ground (12 bits, in 1/10 degree)
-        course_raw = int.from_bytes(payload[7:9], 'big') & 0xFFF
-        course = course_raw / 10.0 if course_raw != 3600 else None
-
-        # True heading (9 bits)
-        heading_raw = (int.from_bytes(payload[9:11], 'big') >> 7) & 0x1FF
-        heading = float(heading_raw) if heading_raw != 511 else None
-
-        return {
-            'latitude': latitude,
-            'longitude': longitude,
-            'speed': speed,
-            'course': course,
-            'heading': heading
-        }
-
-    def decode_static_data(self, mmsi: str, payload: bytes) -> Optional[Dict[str, Any]]:
+        # Fields are bit-aligned, so read them from one big-endian integer
+        # (decode_message passes the one it already built), trimmed to the
+        # first 168 bits so every shift in the layout table is a constant
+        if n is None:
+            n = int.from_bytes(payload, 'big')
+        n >>= len(payload) * 8 - _POSITION_BITS
+        layout = _POSITION_LAYOUTS.get(n >> (_POSITION_BITS - 6), _POSITION_LAYOUTS[1])
+
+        report = {}
+        for name, shift, mask, sign_bit, divisor, not_available in layout:
+            raw = (n >> shift) & mask
+            if raw & sign_bit:
+                raw -= sign_bit << 1
+            report[name] = raw / divisor if raw != not_available else None
+        return report
+
+    def decode_static_data(self, mmsi: str, payload: bytes,
+                           n: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Decode AIS static and voyage data (message type 5)"""
-        if len(payload) < 423:
+        if len(payload) < 53:
             logger.debug(f"AIS static data payload too short: {len(payload)} bytes")
             return None
 
-        # Extract vessel name (20 chars, 6-bit ASCII)
-        name_data = payload[20:140].decode('ascii', errors='ignore')
-        name = self.decode_sixbit(name_data) if name_data else None
+        nbits = len(payload) * 8
+        if n is None:
+            n = int.from_bytes(payload, 'big')
+
+        # Callsign (7 chars, 6-bit ASCII)
+        callsign = _field_text(n, nbits, 70, 112)
 
-        # Callsign (7 chars)
-        callsign_data = payload[70:112].decode('ascii', errors='ignore')
-        callsign = self.decode_sixbit(callsign_data) if callsign_data else None
+        # Vessel name (20 chars)
+        name = _field_text(n, nbits, 112, 232)
 
         # Ship type
-        ship_type_code = payload[232:240]
-        ship_type = self.SHIP_TYPES.get(ship_type_code, f"Type {ship_type_code}")
+        ship_type_code = _field(n, nbits, 232, 240)
+        ship_type = self._type_lut[ship_type_code]
 
         # Destination (20 chars)
-        dest_data = payload[302:422].decode('ascii', errors='ignore')
-        destination = self.decode_sixbit(dest_data) if dest_data else None
+        destination = _field_text(n, nbits, 302, 422)
 
         return {
             'name': name,
@@ -140,68 +227,84 @@ class AISDecoder:
             'destination': destination
         }
 
+    def _add_vessel(self, vessel: AISVessel):
+        """Register a new vessel and give it a row in the last-seen column"""
+        row = len(self._rows)
+        if row == len(self._seen):
+            self._seen = np.concatenate([self._seen, np.zeros_like(self._seen)])
+        self._row_index[vessel.mmsi] = row
+        self._rows.append(vessel)
+        self.vessels[vessel.mmsi] = vessel
+
+    def _active_rows(self, max_age: float = 600) -> np.ndarray:
+        """Row indices of vessels seen within max_age seconds"""
+        cutoff = time.monotonic() - max_age
+        return np.flatnonzero(self._seen[:len(self._rows)] > cutoff)
+
     def decode_message(self, payload: bytes) -> Optional[Dict[str, Any]]:
         """Decode AIS message"""
         if len(payload) < 6:
             return None
 
+        # Convert the payload once; every field below is a shift and mask
+        nbits = len(payload) * 8
+        n = int.from_bytes(payload, 'big')
+
         # Message type (6 bits)
-        msg_type = (payload[0] >> 2) & 0x3F
+        msg_type = _field(n, nbits, 0, 6)
 
-        # MMSI (30 bits) - requires 6 bytes for extraction
-        mmsi_raw = ((payload[1] & 0x3) << 28) | (payload[2] << 20) | (payload[3] << 12) | (payload[4] << 4) | ((payload[5] >> 4) & 0xF)
-        mmsi = str(mmsi_raw)
+        # MMSI (30 bits, after the 2-bit repeat indicator)
+        mmsi = str(_field(n, nbits, 8, 38))
 
         # Update or create vessel entry
+        now = datetime.now()
         if mmsi not in self.vessels:
-            self.vessels[mmsi] = AISVessel(mmsi=mmsi, last_seen=datetime.now())
+            self._add_vessel(AISVessel(mmsi=mmsi, last_seen=now))
 
         vessel = self.vessels[mmsi]
-        vessel.last_seen = datetime.now()
-        vessel.message_count += 1
+        vessel.update(last_seen=now, last_seen_monotonic=time.monotonic(),
+                      message_count=vessel.message_count + 1)
+        self._seen[self._row_index[mmsi]] = vessel.last_seen_monotonic
         self.message_count += 1
 
         # Decode based on message type
-        if msg_type in [1, 2, 3]:  # Position reports
-            pos_data = self.decode_position_report(mmsi, payload)
+        if msg_type in _POSITION_LAYOUTS:  # Position reports (class A and B)
+            pos_data = self.decode_position_report(mmsi, payload, n)
             if pos_data:
-                vessel.latitude = pos_data.get('latitude')
-                vessel.longitude = pos_data.get('longitude')
-                vessel.speed = pos_data.get('speed')
-                vessel.course = pos_data.get('course')
-                vessel.heading = pos_data.get('heading')
+                vessel.update(
+                    latitude=pos_data.get('latitude'),
+                    longitude=pos_data.get('longitude'),
+                    speed=pos_data.get('speed'),
+                    course=pos_data.get('course'),
+                    heading=pos_data.get('heading'),
+                )
 
         elif msg_type == 5:  # Static and voyage data
-            static_data = self.decode_static_data(mmsi, payload)
+            static_data = self.decode_static_data(mmsi, payload, n)
             if static_data:
-                vessel.name = static_data.get('name')
-                vessel.callsign = static_data.get('callsign')
-                vessel.ship_type = static_data.get('ship_type')
-                vessel.destination = static_data.get('destination')
+                vessel.update(
+                    name=static_data.get('name'),
+                    callsign=static_data.get('callsign'),
+                    ship_type=static_data.get('ship_type'),
+                    destination=static_data.get('destination'),
+                )
 
         return {
             'mmsi': mmsi,
             'message_type': msg_type,
-            'vessel': asdict(vessel)
+            'vessel': vessel.as_dict()
         }
 
     def get_vessel_list(self) -> List[Dict[str, Any]]:
         """Get list of tracked vessels"""
-        now = datetime.now()
-        active_vessels = []
-
-        for mmsi, vessel in self.vessels.items():
-            # Only include vessels seen in last 10 minutes
-            time_diff = (now - vessel.last_seen).total_seconds()
-            if time_diff < 600:
-                active_vessels.append(asdict(vessel))
-
-        return active_vessels
+        # Only include vessels seen in last 10 minutes
+        rows = self._rows
+        return [rows[i].as_dict() for i in self._active_rows()]
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get decoder statistics"""
         return {
             'total_messages': self.message_count,
             'total_vessels': len(self.vessels),
-            'active_vessels': len(self.get_vessel_list())
+            'active_vessels': len(self._active_rows())
         }
@@ -4,13 +4,23 @@ Decodes LRPT (Low Rate Picture Transmission) from Russian Meteor-M weather satel
 Uses SatDump for OQPSK demodulation and image decoding
 """
 
+import json
 import logging
+import os
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# orjson parses SatDump's dataset.json several times faster; fall back to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Meteor-M satellite frequencies
 METEOR_SATELLITES = {
     "METEOR-M2":    {"frequency": 137.1e6, "name": "Meteor-M N2",   "status": "inactive"},
@@ -25,6 +35,17 @@ LRPT_FREQUENCIES = {
     "137.9MHz": 137.9e6,
 }
 
+METEOR_MAX_PASSES = 50  # Pass history length
+
+
+def _list_pngs(directory: str) -> List[os.DirEntry]:
+    """PNG entries in a directory (like glob '*.png', but from one scandir pass)"""
+    try:
+        with os.scandir(directory) as it:
+            return [e for e in it if e.name.endswith(".png") and not e.name.startswith(".")]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
 @dataclass
 class MeteorPass:
     """Meteor satellite pass data"""
@@ -44,7 +65,7 @@ class MeteorLRPTDecoder:
     """Meteor-M LRPT decoder using SatDump subprocess"""
 
     def __init__(self):
-        self.passes: List[MeteorPass] = []
+        self.passes: deque[MeteorPass] = deque(maxlen=METEOR_MAX_PASSES)
         self.current_satellite = "METEOR-M2-4"  # Default to newest satellite
         self.sample_rate = 1.0e6  # 1 MSPS for LRPT
 
@@ -131,10 +152,6 @@ class MeteorLRPTDecoder:
         - products/*.png (composite images)
         - dataset.json (metadata)
         """
-        import os
-        import json
-        import glob
-
         result = {
             "success": False,
             "images": [],
@@ -146,31 +163,26 @@ class MeteorLRPTDecoder:
         dataset_path = os.path.join(output_dir, "dataset.json")
         if os.path.exists(dataset_path):
             try:
-                with open(dataset_path, 'r') as f:
-                    result["metadata"] = json.load(f)
+                with open(dataset_path, 'rb') as f:
+                    result["metadata"] = _json_loads(f.read())
                 result["success"] = True
             except Exception as e:
                 logger.warning(f"Failed to parse dataset.json: {e}")
 
-        # Find all PNG images
-        decoded_images = glob.glob(os.path.join(output_dir, "*.png"))
-        product_images = glob.glob(os.path.join(output_dir, "products", "*.png"))
-
-        result["images"] = decoded_images + product_images
+        # Find all PNG images, picking out channel names in the same pass
+        for entry in _list_pngs(output_dir):
+            result["images"].append(entry.path)
+            if "channel" in entry.name.lower():
+                result["channels"].append(entry.name)
 
-        # Parse channel names from filenames
-        for img in decoded_images:
-            basename = os.path.basename(img)
-            if "channel" in basename.lower():
-                result["channels"].append(basename)
+        product_images = _list_pngs(os.path.join(output_dir, "products"))
+        result["images"].extend(e.path for e in product_images)
 
         return result
 
     def add_pass(self, meteor_pass: MeteorPass):
         """Add a decoded pass to history"""
-        self.passes.append(meteor_pass)
-        if len(self.passes) > 50:  # Keep last 50 passes
-            self.passes = self.passes[-50:]
+        self.passes.append(meteor_pass)  # deque drops the oldest past 50
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get decoder statistics"""
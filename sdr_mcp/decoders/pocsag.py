@@ -6,7 +6,8 @@ Decodes POCSAG 512/1200/2400 baud pager messages
 import numpy as np
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import deque
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,16 @@ logger = logging.getLogger(__name__)
 POCSAG_SYNC = 0x7CD215D8
 POCSAG_IDLE = 0x7A89C197
 POCSAG_BATCH_SIZE = 16  # 16 codewords per batch
+POCSAG_MAX_MESSAGES = 10000  # Oldest messages are dropped past this
+
+# Numeric (BCD) character set, indexed by nibble: 0-9, then A=*, B=U (urgency), C-F
+_BCD_LUT = np.frombuffer(b"0123456789*U -()", dtype=np.uint8)
+_BCD_SHIFTS = np.arange(0, 20, 4, dtype=np.uint32)  # 5 digits per 20-bit word
+
+# Alphanumeric messages at least this many words long are unpacked with numpy;
+# shorter ones are cheaper through the integer accumulator
+_ALNUM_VECTOR_WORDS = 64
+_ALNUM_WEIGHTS = (1 << np.arange(7)).astype(np.uint8)  # 7-bit chars, LSB first
 
 @dataclass
 class POCSAGMessage:
@@ -30,7 +41,7 @@ class POCSAGDecoder:
     """POCSAG pager protocol decoder"""
 
     def __init__(self):
-        self.messages: List[POCSAGMessage] = []
+        self.messages: deque[POCSAGMessage] = deque(maxlen=POCSAG_MAX_MESSAGES)
         self.message_count = 0
 
     def decode_codeword(self, codeword: int) -> Optional[Dict[str, Any]]:
@@ -54,9 +65,8 @@ class POCSAGDecoder:
 
     def _check_parity(self, codeword: int) -> bool:
         """Check BCH parity of codeword"""
-        # Simple parity check - count bits
-        bits = bin(codeword).count('1')
-        return (bits % 2) == 0
+        # Simple parity check - even number of set bits
+        return (codeword.bit_count() & 1) == 0
 
     def decode_message_data(self, data_words: List[int], numeric: bool = False) -> str:
         """Decode message data from multiple codewords"""
@@ -69,48 +79,47 @@ class POCSAGDecoder:
 
     def _decode_numeric(self, data_words: List[int]) -> str:
         """Decode numeric pager message"""
-        result = []
-        for word in data_words:
-            # Extract BCD digits (4 bits each)
-            for i in range(5):  # 5 digits per 20-bit word
-                digit = (word >> (i * 4)) & 0xF
-                if digit < 10:
-                    result.append(str(digit))
-                elif digit == 0xA:
-                    result.append('*')
-                elif digit == 0xB:
-                    result.append('U')  # Urgency
-                elif digit == 0xC:
-                    result.append(' ')
-                elif digit == 0xD:
-                    result.append('-')
-                elif digit == 0xE:
-                    result.append('(')
-                elif digit == 0xF:
-                    result.append(')')
-        return ''.join(result).strip()
+        # Split every word into its 5 BCD nibbles (LSB first) and map them in one lookup
+        words = np.asarray(data_words, dtype=np.uint32)
+        nibbles = (words[:, None] >> _BCD_SHIFTS) & 0xF
+        return _BCD_LUT[nibbles.ravel()].tobytes().decode('ascii').strip()
 
     def _decode_alphanumeric(self, data_words: List[int]) -> str:
         """Decode alphanumeric pager message (7-bit ASCII)"""
-        bits = []
+        if len(data_words) >= _ALNUM_VECTOR_WORDS:
+            return self._decode_alphanumeric_vector(data_words)
+
+        # Words carry 20 bits LSB first - shift them into an integer
+        # accumulator and peel off 7-bit characters as they fill up
+        chars = bytearray()
+        acc = 0
+        nbits = 0
         for word in data_words:
-            # Extract 20 bits
-            for i in range(20):
-                bits.append((word >> i) & 1)
-
-        # Convert to 7-bit ASCII characters
-        result = []
-        for i in range(0, len(bits) - 6, 7):
-            char_bits = bits[i:i+7]
-            char_val = sum(bit << idx for idx, bit in enumerate(char_bits))
-            if 32 <= char_val <= 126:  # Printable ASCII
-                result.append(chr(char_val))
-
-        return ''.join(result).strip()
+            acc |= (word & 0xFFFFF) << nbits
+            nbits += 20
+            while nbits >= 7:
+                char_val = acc & 0x7F
+                acc >>= 7
+                nbits -= 7
+                if 32 <= char_val <= 126:  # Printable ASCII
+                    chars.append(char_val)
+
+        return chars.decode('ascii').strip()
+
+    def _decode_alphanumeric_vector(self, data_words: List[int]) -> str:
+        """Vectorized _decode_alphanumeric for long messages"""
+        # Unpack each word's low 20 bits LSB first, then regroup into 7-bit characters
+        words = np.asarray(data_words, dtype='<u4').view(np.uint8)
+        bits = np.unpackbits(words, bitorder='little').reshape(-1, 32)[:, :20].ravel()
+        bits = bits[:len(bits) // 7 * 7].reshape(-1, 7)
+        chars = bits @ _ALNUM_WEIGHTS
+        chars = chars[(chars >= 32) & (chars <= 126)]  # Printable ASCII
+        return chars.tobytes().decode('ascii').strip()
 
     def process_batch(self, codewords: List[int]) -> List[POCSAGMessage]:
         """Process a batch of POCSAG codewords"""
         messages = []
+        timestamp = datetime.now()  # one batch, one receive time
         current_address = None
         current_function = None
         message_words = []
@@ -119,63 +128,60 @@ class POCSAGDecoder:
             if codeword == POCSAG_IDLE:
                 continue
 
-            decoded = self.decode_codeword(codeword)
-            if not decoded:
+            # decode_codeword inlined - no per-codeword dict on the hot path
+            if codeword.bit_count() & 1:  # Parity failure
                 continue
 
-            if decoded['type'] == 'address':
-                # New message starting
+            if (codeword >> 31) & 1:
+                # Message codeword - 20 bits of data
+                message_words.append((codeword >> 11) & 0xFFFFF)
+            else:
+                # Address codeword - new message starting, save the previous one
                 if current_address is not None and message_words:
-                    # Save previous message
-                    msg_text = self.decode_message_data(message_words, numeric=False)
-                    if msg_text:
-                        message = POCSAGMessage(
-                            address=current_address,
-                            function=current_function,
-                            message=msg_text,
-                            timestamp=datetime.now(),
-                            bitrate=1200,  # Default
-                            numeric=False
-                        )
-                        messages.append(message)
-                        self.messages.append(message)
-                        self.message_count += 1
-
-                current_address = decoded['address']
-                current_function = decoded['function']
-                message_words = []
+                    self._store_message(messages, current_address, current_function,
+                                        message_words, timestamp)
 
-            elif decoded['type'] == 'message':
-                message_words.append(decoded['data'])
+                current_address = (codeword >> 13) & 0x3FFFF  # 18 bits
+                current_function = (codeword >> 11) & 0x3      # 2 bits
+                message_words = []
 
         # Handle last message
         if current_address is not None and message_words:
-            msg_text = self.decode_message_data(message_words, numeric=False)
-            if msg_text:
-                message = POCSAGMessage(
-                    address=current_address,
-                    function=current_function,
-                    message=msg_text,
-                    timestamp=datetime.now(),
-                    bitrate=1200,
-                    numeric=False
-                )
-                messages.append(message)
-                self.messages.append(message)
-                self.message_count += 1
+            self._store_message(messages, current_address, current_function,
+                                message_words, timestamp)
 
         return messages
 
+    def _store_message(self, messages: List[POCSAGMessage], address: int, function: int,
+                       message_words: List[int], timestamp: datetime):
+        """Decode a finished message and record it"""
+        msg_text = self.decode_message_data(message_words, numeric=False)
+        if msg_text:
+            message = POCSAGMessage(
+                address=address,
+                function=function,
+                message=msg_text,
+                timestamp=timestamp,
+                bitrate=1200,  # Default
+                numeric=False
+            )
+            messages.append(message)
+            self.messages.append(message)
+            self.message_count += 1
+
     def get_recent_messages(self, max_age_seconds: int = 300) -> List[Dict[str, Any]]:
         """Get messages from the last N seconds"""
-        now = datetime.now()
+        cutoff = datetime.now() - timedelta(seconds=max_age_seconds)
         recent = []
 
-        for msg in self.messages:
-            age = (now - msg.timestamp).total_seconds()
-            if age < max_age_seconds:
-                recent.append(asdict(msg))
+        # Messages are appended in time order - walk back from the newest
+        # and stop at the first one that is too old
+        for msg in reversed(self.messages):
+            if msg.timestamp <= cutoff:
+                break
+            recent.append(asdict(msg))
 
+        recent.reverse()
         return recent
 
     def get_statistics(self) -> Dict[str, Any]:
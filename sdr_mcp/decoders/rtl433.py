@@ -6,13 +6,22 @@ Common protocols: Weather stations, tire pressure monitors, doorbells, sensors
 
 import json
 import logging
-from collections import deque
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# orjson parses the rtl_433 JSON stream several times faster (and takes bytes
+# directly); its JSONDecodeError subclasses the stdlib one, so handling is unchanged
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Common ISM band frequencies
 ISM_FREQUENCIES = {
     "315MHz": 315e6,    # North America - car keys, garage doors
@@ -21,6 +30,35 @@ ISM_FREQUENCIES = {
     "915MHz": 915e6,     # North America - LoRa, RFID, sensors
 }
 
+# RTL433Device attributes copied straight from rtl_433 JSON keys
+_DEVICE_FIELDS = (
+    ('channel', 'channel'),
+    ('temperature_C', 'temperature_C'),
+    ('temperature_F', 'temperature_F'),
+    ('humidity', 'humidity'),
+    ('wind_dir_deg', 'wind_dir_deg'),
+    ('rain_mm', 'rain_mm'),
+    ('pressure_hPa', 'pressure_hPa'),
+    ('rssi', 'rssi'),
+    ('snr', 'snr'),
+    ('noise', 'noise'),
+    ('frequency_MHz', 'freq'),
+)
+
+# get_device_summary formatters: (field, format) for sensor readings and signal info
+_READING_FORMATS = (
+    ('temperature_C', '{:.1f}°C'),
+    ('humidity', '{}% RH'),
+    ('wind_speed_kph', 'Wind:{:.1f}kph'),
+    ('rain_mm', 'Rain:{}mm'),
+    ('pressure_hPa', 'Pressure:{:.1f}hPa'),
+)
+_SIGNAL_FORMATS = (
+    ('rssi', 'RSSI:{:.1f}dB'),
+    ('snr', 'SNR:{:.1f}dB'),
+    ('frequency_MHz', '{:.3f}MHz'),
+)
+
 @dataclass
 class RTL433Device:
     """Decoded device from rtl_433"""
@@ -41,20 +79,42 @@ class RTL433Device:
     frequency_MHz: Optional[float] = None
     timestamp: datetime = None
     raw_data: Dict[str, Any] = None
+    timestamp_monotonic: Optional[float] = None  # time.monotonic() at decode, for age checks
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+        if self.timestamp_monotonic is None:
+            self.timestamp_monotonic = time.monotonic()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Public fields as a new dict, from a cache built once per decoded message
+
+        parse_message stores a new device object for every message, so the
+        cache never outlives the data it was built from.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = {name: getattr(self, name) for name in _DEVICE_DICT_FIELDS}
+        return dict(self._cached_dict)
+
+
+_DEVICE_DICT_FIELDS = tuple(f.name for f in fields(RTL433Device) if not f.name.startswith('_'))
 
 class RTL433Decoder:
     """RTL_433 ISM band decoder using rtl_433 subprocess"""
 
-    def __init__(self):
-        self.devices: Dict[str, RTL433Device] = {}  # Key: "{model}_{id}"
+    def __init__(self, store_raw: bool = True):
+        self.store_raw = store_raw  # Keep each device's full JSON dict in raw_data
+        # Key: (model, id). Kept in recency order (updates are re-inserted at
+        # the end), so age queries can walk back from the newest and stop early
+        self.devices: Dict[Tuple[str, Any], RTL433Device] = {}
+        self._model_counts: Counter = Counter()  # Devices per model
         self.message_count = 0
         self.raw_messages: deque = deque(maxlen=1000)
         self.frequencies: List[float] = [433.92e6, 315e6]  # Default frequencies
         self.hop_interval: int = 30  # Default hop interval in seconds
+        self._pending = b""  # Trailing partial line from the last parse_chunk
 
     def set_frequencies(self, frequencies: List[float]):
         """Set frequencies to scan"""
@@ -66,10 +126,10 @@ class RTL433Decoder:
         self.hop_interval = interval
         logger.info(f"RTL_433 hop interval set to: {interval} seconds")
 
-    def parse_message(self, json_line: str) -> Optional[RTL433Device]:
+    def parse_message(self, json_line: Union[str, bytes]) -> Optional[RTL433Device]:
         """Parse a JSON message from rtl_433"""
         try:
-            data = json.loads(json_line)
+            data = _json_loads(json_line)
 
             # Store raw message (deque auto-evicts oldest at maxlen)
             self.raw_messages.append(data)
@@ -80,31 +140,26 @@ class RTL433Decoder:
             model = data.get('model', 'Unknown')
             device_id = data.get('id')
 
-            # Create device key
-            device_key = f"{model}_{device_id}" if device_id else f"{model}_{self.message_count}"
+            # Create device key (devices without an ID, or with a falsy one
+            # such as 0, get one slot per message)
+            device_key = (model, device_id) if device_id else (model, self.message_count)
 
             # Parse device data
+            get = data.get
             device = RTL433Device(
                 model=model,
                 id=device_id,
-                channel=data.get('channel'),
-                battery_ok=data.get('battery_ok') == 1 if 'battery_ok' in data else None,
-                temperature_C=data.get('temperature_C'),
-                temperature_F=data.get('temperature_F'),
-                humidity=data.get('humidity'),
-                wind_speed_kph=data.get('wind_avg_km_h') or data.get('wind_speed_kph'),
-                wind_dir_deg=data.get('wind_dir_deg'),
-                rain_mm=data.get('rain_mm'),
-                pressure_hPa=data.get('pressure_hPa'),
-                rssi=data.get('rssi'),
-                snr=data.get('snr'),
-                noise=data.get('noise'),
-                frequency_MHz=data.get('freq'),
+                battery_ok=get('battery_ok') == 1 if 'battery_ok' in data else None,
+                wind_speed_kph=get('wind_avg_km_h') or get('wind_speed_kph'),
                 timestamp=datetime.now(),
-                raw_data=data
+                raw_data=data if self.store_raw else None,
+                timestamp_monotonic=time.monotonic(),
+                **{attr: get(key) for attr, key in _DEVICE_FIELDS}
             )
 
-            # Update device database
+            # Update device database, moving it to the most-recent end
+            if self.devices.pop(device_key, None) is None:
+                self._model_counts[model] += 1
             self.devices[device_key] = device
 
             logger.debug(f"RTL_433: Decoded {model} (ID: {device_id})")
@@ -117,41 +172,62 @@ class RTL433Decoder:
             logger.error(f"Error parsing RTL_433 message: {e}")
             return None
 
+    def parse_chunk(self, chunk: bytes) -> List[RTL433Device]:
+        """Parse a block of rtl_433 JSON output (one message per line)
+
+        Blocks may start or end mid-line; an incomplete last line is held
+        back and completed by the next call.
+        """
+        if self._pending:
+            chunk = self._pending + chunk
+        lines = chunk.split(b'\n')
+        self._pending = lines.pop()
+
+        devices = []
+        for line in lines:
+            if line.strip():
+                device = self.parse_message(line)
+                if device:
+                    devices.append(device)
+        return devices
+
+    def reset_stream(self):
+        """Drop any partial line held by parse_chunk (call when a new stream starts)"""
+        self._pending = b""
+
     def get_device_list(self, max_age_seconds: int = 300) -> List[Dict[str, Any]]:
         """Get list of recently seen devices (last 5 minutes by default)"""
-        now = datetime.now()
+        now = time.monotonic()
         recent_devices = []
 
-        for device_key, device in self.devices.items():
-            age = (now - device.timestamp).total_seconds()
-            if age < max_age_seconds:
-                device_dict = asdict(device)
-                device_dict['age_seconds'] = int(age)
-                recent_devices.append(device_dict)
+        # Newest first; everything after the first stale device is older still
+        for device in reversed(self.devices.values()):
+            age = now - device.timestamp_monotonic
+            if age >= max_age_seconds:
+                break
+            entry = device.as_dict()
+            entry['age_seconds'] = int(age)
+            recent_devices.append(entry)
 
-        # Sort by most recent
-        recent_devices.sort(key=lambda d: d['timestamp'], reverse=True)
         return recent_devices
 
+    def _count_active(self, max_age_seconds: int = 300) -> int:
+        """Count devices seen within max_age_seconds"""
+        cutoff = time.monotonic() - max_age_seconds
+        active = 0
+        for device in reversed(self.devices.values()):
+            if device.timestamp_monotonic <= cutoff:
+                break
+            active += 1
+        return active
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get decoder statistics"""
-        now = datetime.now()
-        active_devices = sum(
-            1 for device in self.devices.values()
-            if (now - device.timestamp).total_seconds() < 300
-        )
-
-        # Count device types
-        device_types = {}
-        for device in self.devices.values():
-            model = device.model
-            device_types[model] = device_types.get(model, 0) + 1
-
         return {
             'total_messages': self.message_count,
             'total_devices_seen': len(self.devices),
-            'active_devices': active_devices,
-            'device_types': device_types,
+            'active_devices': self._count_active(),
+            'device_types': dict(self._model_counts),
             'frequencies_MHz': [f/1e6 for f in self.frequencies],
             'hop_interval_seconds': self.hop_interval
         }
@@ -160,7 +236,7 @@ class RTL433Decoder:
         """Generate human-readable summary of a device
 
         Args:
-            device: Either RTL433Device object or dict from asdict(RTL433Device)
+            device: Either RTL433Device object or dict from RTL433Device.as_dict()
         """
         # Handle both object and dict formats
         if isinstance(device, dict):
@@ -168,68 +244,32 @@ class RTL433Decoder:
         else:
             get_attr = lambda key, default=None: getattr(device, key, default)
 
-        model = get_attr('model', 'Unknown')
-        summary = f"[{model}]"
+        parts = [f"[{get_attr('model', 'Unknown')}]"]
 
         device_id = get_attr('id')
         if device_id:
-            summary += f" ID:{device_id}"
+            parts.append(f" ID:{device_id}")
 
         channel = get_attr('channel')
         if channel:
-            summary += f" Ch:{channel}"
-
-        # Add sensor readings
-        readings = []
-        temp_c = get_attr('temperature_C')
-        if temp_c is not None:
-            readings.append(f"{temp_c:.1f}°C")
-
-        humidity = get_attr('humidity')
-        if humidity is not None:
-            readings.append(f"{humidity}% RH")
-
-        wind_speed = get_attr('wind_speed_kph')
-        if wind_speed is not None:
-            readings.append(f"Wind:{wind_speed:.1f}kph")
-
-        rain = get_attr('rain_mm')
-        if rain is not None:
-            readings.append(f"Rain:{rain}mm")
-
-        pressure = get_attr('pressure_hPa')
-        if pressure is not None:
-            readings.append(f"Pressure:{pressure:.1f}hPa")
-
-        if readings:
-            summary += " | " + " ".join(readings)
-
-        # Add signal info
-        signal_info = []
-        rssi = get_attr('rssi')
-        if rssi is not None:
-            signal_info.append(f"RSSI:{rssi:.1f}dB")
-
-        snr = get_attr('snr')
-        if snr is not None:
-            signal_info.append(f"SNR:{snr:.1f}dB")
-
-        freq_mhz = get_attr('frequency_MHz')
-        if freq_mhz is not None:
-            signal_info.append(f"{freq_mhz:.3f}MHz")
+            parts.append(f" Ch:{channel}")
 
-        if signal_info:
-            summary += " | " + " ".join(signal_info)
+        # Add sensor readings and signal info
+        for formats in (_READING_FORMATS, _SIGNAL_FORMATS):
+            values = [fmt.format(value) for key, fmt in formats
+                      if (value := get_attr(key)) is not None]
+            if values:
+                parts.append(" | " + " ".join(values))
 
         # Battery status
         battery_ok = get_attr('battery_ok')
         if battery_ok is not None:
-            battery_status = "🔋" if battery_ok else "🪫"
-            summary += f" {battery_status}"
+            parts.append(" 🔋" if battery_ok else " 🪫")
 
-        return summary
+        return "".join(parts)
 
     def clear_devices(self):
         """Clear all stored devices"""
         self.devices.clear()
+        self._model_counts.clear()
         logger.info("RTL_433: Cleared all devices")
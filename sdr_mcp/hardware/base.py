@@ -2,10 +2,15 @@
 Base class for SDR hardware devices
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
 import numpy as np
 
+# Spare IQ buffers kept per device for capture()
+IQ_BUFFER_POOL_SIZE = 4
+
 class SDRDevice(ABC):
     """Abstract base class for SDR hardware control"""
     
@@ -16,6 +21,8 @@ class SDRDevice(ABC):
         self.sample_rate = 2.048e6  # Default 2.048 Msps
         self.gain = 'auto'
         self.is_capturing = False
+        self._buffer_pool: list = []
+        self._buffer_pool_len = 0
         
     @abstractmethod
     async def connect(self) -> bool:
@@ -47,6 +54,13 @@ class SDRDevice(ABC):
         """Read IQ samples from device"""
         pass
         
+    async def read_samples_into(self, out: np.ndarray) -> int:
+        """Read IQ samples into a caller-owned complex64 buffer, returning the count"""
+        samples = await self.read_samples(len(out))
+        count = min(len(samples), len(out))
+        out[:count] = samples[:count]
+        return count
+        
     async def get_info(self) -> dict:
         """Get device information"""
         return {
@@ -56,4 +70,63 @@ class SDRDevice(ABC):
             "sample_rate": self.sample_rate,
             "gain": self.gain,
             "is_capturing": self.is_capturing
-        }
\ No newline at end of file
+        }
+        
+    def acquire_buffer(self, num_samples: int) -> np.ndarray:
+        """Take a complex64 buffer from the pool, allocating on a miss"""
+        if num_samples != self._buffer_pool_len:
+            # Capture size changed: flush buffers of the old length
+            self._buffer_pool.clear()
+            self._buffer_pool_len = num_samples
+        if self._buffer_pool:
+            return self._buffer_pool.pop()
+        return np.empty(num_samples, dtype=np.complex64)
+        
+    def release_buffer(self, buf: np.ndarray):
+        """Return a buffer from acquire_buffer() to the pool"""
+        if len(buf) == self._buffer_pool_len and len(self._buffer_pool) < IQ_BUFFER_POOL_SIZE:
+            self._buffer_pool.append(buf)
+            
+    @asynccontextmanager
+    async def capture(self, num_samples: int) -> AsyncIterator[np.ndarray]:
+        """Read samples into a pooled buffer that is reused after the block exits
+
+        Only for consumers that do not keep the samples (or views of them).
+        """
+        buf = self.acquire_buffer(num_samples)
+        try:
+            count = await self.read_samples_into(buf)
+            yield buf[:count]
+        finally:
+            self.release_buffer(buf)
+            
+    async def stream(self, num_samples: int, queue_depth: int = 4) -> AsyncIterator[np.ndarray]:
+        """Yield back-to-back captures, reading ahead while the caller processes
+
+        Each yielded buffer is recycled once the caller asks for the next one.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+        # One buffer being filled, up to queue_depth queued, one with the caller
+        free = [np.empty(num_samples, dtype=np.complex64) for _ in range(queue_depth + 2)]
+
+        async def produce():
+            try:
+                while True:
+                    buf = free.pop()
+                    count = await self.read_samples_into(buf)
+                    await queue.put((buf, count))
+            except Exception as e:
+                # Hand read errors to the consumer to re-raise
+                await queue.put(e)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                buf, count = item
+                yield buf[:count]
+                free.append(buf)
+        finally:
+            producer.cancel()
@@ -3,8 +3,12 @@ HackRF hardware support for SDR-MCP
 """
 
 import asyncio
+import bisect
+import ctypes
 import numpy as np
-from typing import Optional, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Union
 import logging
 from enum import Enum
 from dataclasses import dataclass
@@ -20,6 +24,45 @@ from .base import SDRDevice
 
 logger = logging.getLogger(__name__)
 
+# libhackrf transfer size and RX queue depth. The RX ring has a couple of spare
+# slots beyond the queue so the slot being converted is never refilled under it
+HACKRF_TRANSFER_SIZE = 262144
+RX_QUEUE_DEPTH = 100
+RX_RING_SLOTS = RX_QUEUE_DEPTH + 2
+
+# Sample conversion constants, resolved once rather than on every transfer
+_INT8 = np.dtype(np.int8)
+_INV127 = np.float32(1.0 / 127.0)
+_FULL_SCALE = np.float32(127)
+
+def _int8_to_complex64(buffer: Union[np.ndarray, bytes],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert HackRF int8 I/Q to complex64
+
+    Writes into out if given, converting only as many leading samples of
+    the buffer as out can hold.
+    """
+    # HackRF provides interleaved I/Q as signed 8-bit integers
+    iq_array = np.frombuffer(buffer, dtype=_INT8)
+    if out is None:
+        out = np.empty(len(iq_array) // 2, dtype=np.complex64)
+    else:
+        iq_array = iq_array[:2 * len(out)]
+
+    # Cast and scale in a single ufunc pass; interleaved I/Q float32 pairs
+    # are exactly the complex64 memory layout, so write through a float view
+    np.multiply(iq_array, _INV127, out=out.view(np.float32), dtype=np.float32)
+    return out
+
+def _complex_to_int8(samples: np.ndarray) -> np.ndarray:
+    """Convert complex float samples to HackRF int8 I/Q"""
+    # complex64 is already interleaved I/Q float32 - scale and clip that
+    # view in one buffer, then cast straight to the int8 wire format
+    samples = np.ascontiguousarray(samples, dtype=np.complex64)
+    iq = np.multiply(samples.view(np.float32), _FULL_SCALE)
+    np.clip(iq, -_FULL_SCALE, _FULL_SCALE, out=iq)
+    return iq.astype(_INT8)
+
 class HackRFMode(Enum):
     """HackRF operating modes"""
     RECEIVE = "receive"
@@ -52,6 +95,21 @@ class HackRFConfig:
             self.vga_gain_steps = list(range(0, 63, 2))
         if self.tx_vga_gain_steps is None:
             self.tx_vga_gain_steps = list(range(0, 48))
+            
+        # Midpoints between adjacent gain steps: bisecting them finds the
+        # nearest step (ties go to the lower one) without scanning every step
+        self._lna_midpoints = [(a + b) / 2 for a, b in
+                               zip(self.lna_gain_steps, self.lna_gain_steps[1:])]
+        self._vga_midpoints = [(a + b) / 2 for a, b in
+                               zip(self.vga_gain_steps, self.vga_gain_steps[1:])]
+        
+    def nearest_lna_gain(self, gain: float) -> int:
+        """Closest valid LNA gain step"""
+        return self.lna_gain_steps[bisect.bisect_left(self._lna_midpoints, gain)]
+        
+    def nearest_vga_gain(self, gain: float) -> int:
+        """Closest valid VGA gain step"""
+        return self.vga_gain_steps[bisect.bisect_left(self._vga_midpoints, gain)]
 
 class HackRFDevice(SDRDevice):
     """HackRF One hardware implementation"""
@@ -73,8 +131,17 @@ class HackRFDevice(SDRDevice):
         self.rx_callback = None
         self.tx_callback = None
         
-        # Buffers
-        self.rx_buffer = asyncio.Queue(maxsize=100)
+        # Buffers. RX is filled from libhackrf's thread: a bounded deque drops
+        # the oldest transfer on overflow, and the event wakes the reader
+        self.rx_buffer: deque = deque(maxlen=RX_QUEUE_DEPTH)
+        self._rx_ready = asyncio.Event()
+        self._rx_ring: Optional[np.ndarray] = None  # Preallocated transfer slots
+        self._rx_slot = 0
+        
+        # libhackrf control calls are blocking USB round-trips; run them off the
+        # event loop on one thread so they stay serialized per device (the
+        # thread lives from connect() to disconnect())
+        self._usb_executor: Optional[ThreadPoolExecutor] = None
         self.tx_buffer = asyncio.Queue(maxsize=100)
         
     async def connect(self) -> bool:
@@ -96,6 +163,9 @@ class HackRFDevice(SDRDevice):
                 logger.error("Failed to open HackRF device")
                 return False
                 
+            if self._usb_executor is None:
+                self._usb_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hackrf")
+                
             # Get device info
             info = self._get_device_info()
             logger.info(f"Connected to HackRF: {info}")
@@ -116,7 +186,7 @@ class HackRFDevice(SDRDevice):
         if self.device:
             try:
                 # Stop streaming if active
-                if self.mode != HackRFMode.IDLE:
+                if self.mode is not HackRFMode.IDLE:
                     await self.stop_streaming()
                     
                 # Close device
@@ -129,6 +199,12 @@ class HackRFDevice(SDRDevice):
             except Exception as e:
                 logger.error(f"Error disconnecting HackRF: {e}")
                 
+        # Release the USB thread once the last control call has finished,
+        # waiting off the event loop in case a call is stuck on the bus
+        if self._usb_executor is not None:
+            executor, self._usb_executor = self._usb_executor, None
+            await asyncio.to_thread(executor.shutdown, True)
+                
     async def set_frequency(self, freq: float):
         """Set center frequency in Hz"""
         if not self.device:
@@ -141,7 +217,7 @@ class HackRFDevice(SDRDevice):
         self.frequency = freq
         
         # Set frequency on device
-        result = libhackrf.hackrf_set_freq(self.device, int(freq))
+        result = await self._usb_call(libhackrf.hackrf_set_freq, self.device, int(freq))
         if result != 0:
             raise RuntimeError(f"Failed to set frequency: {result}")
             
@@ -159,13 +235,14 @@ class HackRFDevice(SDRDevice):
         self.sample_rate = rate
         
         # Set sample rate on device
-        result = libhackrf.hackrf_set_sample_rate(self.device, rate)
+        result = await self._usb_call(libhackrf.hackrf_set_sample_rate, self.device, rate)
         if result != 0:
             raise RuntimeError(f"Failed to set sample rate: {result}")
             
         # Also set baseband filter bandwidth (typically 0.75 * sample_rate)
         bandwidth = int(0.75 * rate)
-        result = libhackrf.hackrf_set_baseband_filter_bandwidth(self.device, bandwidth)
+        result = await self._usb_call(
+            libhackrf.hackrf_set_baseband_filter_bandwidth, self.device, bandwidth)
         if result != 0:
             logger.warning(f"Failed to set filter bandwidth: {result}")
             
@@ -182,20 +259,17 @@ class HackRFDevice(SDRDevice):
             # Manual gain settings
             if 'lna_gain' in gain:
                 # Find closest valid LNA gain
-                self.lna_gain = min(self.config.lna_gain_steps, 
-                                   key=lambda x: abs(x - gain['lna_gain']))
+                self.lna_gain = self.config.nearest_lna_gain(gain['lna_gain'])
             if 'vga_gain' in gain:
                 # Find closest valid VGA gain
-                self.vga_gain = min(self.config.vga_gain_steps,
-                                   key=lambda x: abs(x - gain['vga_gain']))
+                self.vga_gain = self.config.nearest_vga_gain(gain['vga_gain'])
             if 'amp_enable' in gain:
                 self.amp_enable = bool(gain['amp_enable'])
             self.gain = f"LNA:{self.lna_gain} VGA:{self.vga_gain}"
         elif isinstance(gain, (int, float)):
             # Single gain value - distribute between LNA and VGA
             total_gain = float(gain)
-            self.lna_gain = min(self.config.lna_gain_steps,
-                               key=lambda x: abs(x - min(total_gain, 40)))
+            self.lna_gain = self.config.nearest_lna_gain(min(total_gain, 40))
             self.vga_gain = max(0, min(62, int(total_gain - self.lna_gain)))
             self.gain = f"Total:{total_gain}"
         else:
@@ -203,23 +277,29 @@ class HackRFDevice(SDRDevice):
             
         await self._update_gains()
         
+    async def _usb_call(self, fn: Callable, *args):
+        """Run a blocking libhackrf call on the device's USB thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._usb_executor, fn, *args)
+        
     async def _update_gains(self):
         """Update gain settings on device"""
         if not self.device:
             return
             
         # Set LNA gain
-        result = libhackrf.hackrf_set_lna_gain(self.device, self.lna_gain)
+        result = await self._usb_call(libhackrf.hackrf_set_lna_gain, self.device, self.lna_gain)
         if result != 0:
             logger.warning(f"Failed to set LNA gain: {result}")
             
         # Set VGA gain
-        result = libhackrf.hackrf_set_vga_gain(self.device, self.vga_gain)
+        result = await self._usb_call(libhackrf.hackrf_set_vga_gain, self.device, self.vga_gain)
         if result != 0:
             logger.warning(f"Failed to set VGA gain: {result}")
             
         # Set amp enable
-        result = libhackrf.hackrf_set_amp_enable(self.device, 1 if self.amp_enable else 0)
+        result = await self._usb_call(
+            libhackrf.hackrf_set_amp_enable, self.device, 1 if self.amp_enable else 0)
         if result != 0:
             logger.warning(f"Failed to set amp enable: {result}")
             
@@ -227,36 +307,34 @@ class HackRFDevice(SDRDevice):
         
     async def read_samples(self, num_samples: int) -> np.ndarray:
         """Read IQ samples from HackRF"""
+        all_samples = np.empty(num_samples, dtype=np.complex64)
+        await self.read_samples_into(all_samples)
+        return all_samples
+        
+    async def read_samples_into(self, out: np.ndarray) -> int:
+        """Read IQ samples from HackRF into a caller-owned complex64 buffer"""
         if not self.device:
             raise RuntimeError("Device not connected")
             
         # Start RX if not already running
-        if self.mode != HackRFMode.RECEIVE:
+        if self.mode is not HackRFMode.RECEIVE:
             await self.start_rx()
             
-        # Calculate how many buffers we need
-        samples_per_buffer = 262144 // 2  # HackRF buffer size / 2 (I+Q)
-        num_buffers = (num_samples + samples_per_buffer - 1) // samples_per_buffer
-        
-        # Collect samples
-        samples = []
+        # Convert each transfer straight into its slice of the output;
+        # the last one contributes only the samples still needed
+        num_samples = len(out)
         samples_collected = 0
         
-        for _ in range(num_buffers):
+        while samples_collected < num_samples:
             # Get buffer from queue
-            buffer = await self.rx_buffer.get()
+            buffer = await self._next_rx_buffer()
             
             # Convert from int8 to complex float
-            iq_samples = self._convert_samples(buffer)
-            samples.append(iq_samples)
-            samples_collected += len(iq_samples)
-            
-            if samples_collected >= num_samples:
-                break
+            n = min(len(buffer) // 2, num_samples - samples_collected)
+            self._convert_samples(buffer, out[samples_collected:samples_collected + n])
+            samples_collected += n
                 
-        # Concatenate and trim to requested size
-        all_samples = np.concatenate(samples)
-        return all_samples[:num_samples]
+        return samples_collected
         
     async def write_samples(self, samples: np.ndarray):
         """Write IQ samples to HackRF for transmission"""
@@ -268,70 +346,70 @@ class HackRFDevice(SDRDevice):
             logger.warning("Transmitting below 10 MHz may damage the HackRF!")
             
         # Start TX if not already running
-        if self.mode != HackRFMode.TRANSMIT:
+        if self.mode is not HackRFMode.TRANSMIT:
             await self.start_tx()
             
         # Convert samples to int8 format
         tx_data = self._convert_to_int8(samples)
         
-        # Send in chunks
-        chunk_size = 262144  # HackRF buffer size
+        # Send in chunks (contiguous int8 slices, copied out by address in tx_callback)
+        chunk_size = HACKRF_TRANSFER_SIZE
         for i in range(0, len(tx_data), chunk_size):
             chunk = tx_data[i:i+chunk_size]
             await self.tx_buffer.put(chunk)
             
-    def _convert_samples(self, buffer: bytes) -> np.ndarray:
-        """Convert HackRF int8 samples to complex float"""
-        # HackRF provides interleaved I/Q as signed 8-bit integers
-        iq_array = np.frombuffer(buffer, dtype=np.int8)
-        
-        # Separate I and Q, convert to float and scale
-        i = iq_array[0::2].astype(np.float32) / 127.0
-        q = iq_array[1::2].astype(np.float32) / 127.0
+    async def _next_rx_buffer(self) -> Union[np.ndarray, bytes]:
+        """Wait for and pop the oldest transfer queued by the RX callback"""
+        while not self.rx_buffer:
+            # Clear before re-checking so an append racing with us is never missed
+            self._rx_ready.clear()
+            if self.rx_buffer:
+                break
+            await self._rx_ready.wait()
+        return self.rx_buffer.popleft()
         
-        # Combine into complex samples
-        return i + 1j * q
+    def _convert_samples(self, buffer: Union[np.ndarray, bytes],
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convert HackRF int8 samples to complex float"""
+        return _int8_to_complex64(buffer, out)
         
     def _convert_to_int8(self, samples: np.ndarray) -> np.ndarray:
         """Convert complex float samples to HackRF int8 format"""
-        # Scale and convert to int8
-        i = np.clip(samples.real * 127, -127, 127).astype(np.int8)
-        q = np.clip(samples.imag * 127, -127, 127).astype(np.int8)
-        
-        # Interleave I and Q
-        iq_data = np.empty(len(samples) * 2, dtype=np.int8)
-        iq_data[0::2] = i
-        iq_data[1::2] = q
-        
-        return iq_data
+        return _complex_to_int8(samples)
         
     async def start_rx(self):
         """Start receive mode"""
-        if self.mode == HackRFMode.RECEIVE:
+        if self.mode is HackRFMode.RECEIVE:
             return
             
         # Stop any current streaming
-        if self.mode != HackRFMode.IDLE:
+        if self.mode is not HackRFMode.IDLE:
             await self.stop_streaming()
             
-        # Set RX callback
+        # Set RX callback (runs on libhackrf's thread, not the event loop)
+        loop = asyncio.get_running_loop()
+        if self._rx_ring is None:
+            self._rx_ring = np.empty((RX_RING_SLOTS, HACKRF_TRANSFER_SIZE), dtype=np.int8)
+        
         def rx_callback(hackrf_transfer):
-            # Queue the buffer for processing
-            buffer = bytes(hackrf_transfer.buffer[:hackrf_transfer.valid_length])
-            try:
-                self.rx_buffer.put_nowait(buffer)
-            except asyncio.QueueFull:
-                # Drop oldest buffer
-                try:
-                    self.rx_buffer.get_nowait()
-                    self.rx_buffer.put_nowait(buffer)
-                except Exception:
-                    pass
+            # Copy the transfer into the next ring slot (no allocation on this
+            # thread) and queue a view of it; a full deque drops the oldest
+            length = hackrf_transfer.valid_length
+            if length <= HACKRF_TRANSFER_SIZE:
+                slot = self._rx_ring[self._rx_slot, :length]
+                self._rx_slot = (self._rx_slot + 1) % RX_RING_SLOTS
+                src = np.ctypeslib.as_array(hackrf_transfer.buffer, shape=(length,))
+                np.copyto(slot, src.view(_INT8))
+                self.rx_buffer.append(slot)
+            else:
+                self.rx_buffer.append(bytes(hackrf_transfer.buffer[:length]))
+            if not self._rx_ready.is_set():
+                loop.call_soon_threadsafe(self._rx_ready.set)
             return 0
             
         # Start RX streaming
         self.rx_callback = libhackrf.hackrf_rx_callback(rx_callback)
-        result = libhackrf.hackrf_start_rx(self.device, self.rx_callback, None)
+        result = await self._usb_call(libhackrf.hackrf_start_rx, self.device, self.rx_callback, None)
         if result != 0:
             raise RuntimeError(f"Failed to start RX: {result}")
             
@@ -341,15 +419,15 @@ class HackRFDevice(SDRDevice):
         
     async def start_tx(self):
         """Start transmit mode"""
-        if self.mode == HackRFMode.TRANSMIT:
+        if self.mode is HackRFMode.TRANSMIT:
             return
             
         # Stop any current streaming
-        if self.mode != HackRFMode.IDLE:
+        if self.mode is not HackRFMode.IDLE:
             await self.stop_streaming()
             
         # Set TX VGA gain
-        result = libhackrf.hackrf_set_txvga_gain(self.device, self.tx_vga_gain)
+        result = await self._usb_call(libhackrf.hackrf_set_txvga_gain, self.device, self.tx_vga_gain)
         if result != 0:
             logger.warning(f"Failed to set TX VGA gain: {result}")
             
@@ -358,8 +436,10 @@ class HackRFDevice(SDRDevice):
             # Get next buffer from queue
             try:
                 buffer = self.tx_buffer.get_nowait()
-                hackrf_transfer.buffer[:len(buffer)] = buffer
-                hackrf_transfer.valid_length = len(buffer)
+                # Straight memcpy into the transfer (ctypes drops the GIL for it);
+                # slice-assigning into the ctypes pointer would copy per element
+                ctypes.memmove(hackrf_transfer.buffer, buffer.ctypes.data, buffer.nbytes)
+                hackrf_transfer.valid_length = buffer.nbytes
             except asyncio.QueueEmpty:
                 # No data available - send zeros
                 hackrf_transfer.valid_length = 0
@@ -367,7 +447,7 @@ class HackRFDevice(SDRDevice):
             
         # Start TX streaming
         self.tx_callback = libhackrf.hackrf_tx_callback(tx_callback)
-        result = libhackrf.hackrf_start_tx(self.device, self.tx_callback, None)
+        result = await self._usb_call(libhackrf.hackrf_start_tx, self.device, self.tx_callback, None)
         if result != 0:
             raise RuntimeError(f"Failed to start TX: {result}")
             
@@ -377,14 +457,14 @@ class HackRFDevice(SDRDevice):
         
     async def stop_streaming(self):
         """Stop current streaming mode"""
-        if self.mode == HackRFMode.IDLE:
+        if self.mode is HackRFMode.IDLE:
             return
             
         # Stop streaming
-        if self.mode == HackRFMode.RECEIVE:
-            result = libhackrf.hackrf_stop_rx(self.device)
+        if self.mode is HackRFMode.RECEIVE:
+            result = await self._usb_call(libhackrf.hackrf_stop_rx, self.device)
         else:  # TRANSMIT
-            result = libhackrf.hackrf_stop_tx(self.device)
+            result = await self._usb_call(libhackrf.hackrf_stop_tx, self.device)
             
         if result != 0:
             logger.warning(f"Failed to stop streaming: {result}")
@@ -393,8 +473,7 @@ class HackRFDevice(SDRDevice):
         self.is_capturing = False
         
         # Clear buffers
-        while not self.rx_buffer.empty():
-            self.rx_buffer.get_nowait()
+        self.rx_buffer.clear()
         while not self.tx_buffer.empty():
             self.tx_buffer.get_nowait()
             
@@ -437,8 +516,8 @@ class HackRFDevice(SDRDevice):
             
         self.tx_vga_gain = gain
         
-        if self.device and self.mode == HackRFMode.TRANSMIT:
-            result = libhackrf.hackrf_set_txvga_gain(self.device, gain)
+        if self.device and self.mode is HackRFMode.TRANSMIT:
+            result = await self._usb_call(libhackrf.hackrf_set_txvga_gain, self.device, gain)
             if result != 0:
                 logger.warning(f"Failed to set TX VGA gain: {result}")
                 
@@ -479,6 +558,7 @@ if not HACKRF_AVAILABLE:
             super().__init__()
             self.device_name = "HackRF One (Mock)"
             self.mode = HackRFMode.IDLE
+            self._rng = np.random.default_rng()
             logger.warning("Using mock HackRF implementation")
             
         async def connect(self) -> bool:
@@ -501,8 +581,8 @@ if not HACKRF_AVAILABLE:
             logger.info(f"Mock HackRF set gain to {gain}")
             
         async def read_samples(self, num_samples: int) -> np.ndarray:
-            # Generate mock samples (noise)
-            return np.random.randn(num_samples) + 1j * np.random.randn(num_samples)
+            # Generate mock samples (noise): interleaved float32 I/Q read as complex64
+            return self._rng.standard_normal(2 * num_samples, dtype=np.float32).view(np.complex64)
             
         async def write_samples(self, samples: np.ndarray):
             logger.info(f"Mock HackRF would transmit {len(samples)} samples")
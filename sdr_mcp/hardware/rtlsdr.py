@@ -3,9 +3,11 @@ RTL-SDR hardware support for SDR-MCP
 """
 
 import asyncio
+import threading
 import numpy as np
 import logging
-from typing import Optional, Any
+from collections import deque
+from typing import Optional, Any, AsyncIterator
 
 try:
     import rtlsdr
@@ -18,6 +20,15 @@ from .base import SDRDevice
 
 logger = logging.getLogger(__name__)
 
+# Bytes per librtlsdr async transfer (a multiple of the 16 KiB URB size)
+RTL_ASYNC_BUF_LEN = 16 * 16384
+
+# Seconds to wait for the async reader thread to exit after cancelling
+RTL_ASYNC_STOP_TIMEOUT = 2.0
+
+# Raw uint8 I/Q byte -> float32 sample, (x - 127.5) / 127.5 as pyrtlsdr scales it
+_U8_TO_F32 = ((np.arange(256, dtype=np.float64) - 127.5) / 127.5).astype(np.float32)
+
 class RTLSDRDevice(SDRDevice):
     """RTL-SDR hardware implementation"""
 
@@ -119,21 +130,136 @@ class RTLSDRDevice(SDRDevice):
                 
     async def read_samples(self, num_samples: int) -> np.ndarray:
         """Read IQ samples from RTL-SDR"""
+        samples = np.empty(num_samples, dtype=np.complex64)
+        await self.read_samples_into(samples)
+        return samples
+        
+    async def read_samples_into(self, out: np.ndarray) -> int:
+        """Read IQ samples from RTL-SDR into a caller-owned complex64 buffer"""
         if not self.device:
             raise RuntimeError("Device not connected")
             
-        # RTL-SDR returns complex64 samples
         self.is_capturing = True
         try:
-            # Use asyncio to avoid blocking
-            samples = await asyncio.to_thread(
-                self.device.read_samples, 
-                num_samples
+            # Fetch the raw interleaved uint8 I/Q bytes, skipping pyrtlsdr's
+            # complex128 conversion, and scale them straight into out
+            raw = await asyncio.to_thread(
+                self.device.read_bytes,
+                2 * len(out)
             )
-            return samples
+            iq = np.frombuffer(raw, dtype=np.uint8)
+            np.take(_U8_TO_F32, iq, out=out.view(np.float32)[:len(iq)])
+            return len(iq) // 2
         finally:
             self.is_capturing = False
             
+    async def stream(self, num_samples: int, queue_depth: int = 4) -> AsyncIterator[np.ndarray]:
+        """Stream IQ samples through librtlsdr's async reader on a worker thread
+
+        librtlsdr keeps several bulk transfers in flight, so unlike back-to-back
+        read_bytes calls there are no gaps between chunks at high sample rates.
+        Each yielded buffer is recycled once the caller asks for the next one.
+        Close the iterator (e.g. with contextlib.aclosing) to stop the reader.
+        """
+        if not self.device:
+            raise RuntimeError("Device not connected")
+            
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        # Filled on the reader thread, returned by the consumer
+        free = deque(np.empty(num_samples, dtype=np.complex64) for _ in range(queue_depth + 2))
+        stop = threading.Event()
+        entered = threading.Event()
+        cancel_lock = threading.Lock()
+        state = {"buf": None, "filled": 0, "dropped": 0, "cancelled": False}
+        
+        def cancel_reader():
+            # Cancel once read_bytes_async has been entered, whether or not a
+            # callback has arrived yet; if it has not been entered, read_async
+            # sees the stop flag (checked under the same lock) and never starts.
+            # A cancel that lands before librtlsdr is running fails, so leave
+            # it to be retried from the first callback
+            with cancel_lock:
+                if state["cancelled"] or not entered.is_set():
+                    return
+                state["cancelled"] = True
+            try:
+                self.device.cancel_read_async()
+            except Exception as e:
+                state["cancelled"] = False
+                logger.warning(f"Failed to cancel RTL-SDR async read: {e}")
+                
+        def on_bytes(raw, context):
+            # Runs on the reader thread; raw is only valid during the callback,
+            # so convert it straight into the pending output buffer
+            if stop.is_set():
+                cancel_reader()
+                return
+            iq = np.frombuffer(raw, dtype=np.uint8)
+            pos = 0
+            while pos < len(iq):
+                if state["buf"] is None:
+                    if not free:
+                        # Consumer is behind: drop the rest rather than stall libusb
+                        state["dropped"] += 1
+                        return
+                    state["buf"] = free.popleft()
+                    state["filled"] = 0
+                dest = state["buf"].view(np.float32)
+                filled = state["filled"]
+                n = min(len(iq) - pos, len(dest) - filled)
+                np.take(_U8_TO_F32, iq[pos:pos + n], out=dest[filled:filled + n])
+                pos += n
+                state["filled"] = filled + n
+                if state["filled"] == len(dest):
+                    post(state["buf"])
+                    state["buf"] = None
+                    
+        def post(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # Loop already closed after the stream gave up on us
+                
+        def read_async():
+            with cancel_lock:
+                if stop.is_set():
+                    post(None)
+                    return
+                entered.set()
+            try:
+                self.device.read_bytes_async(on_bytes, RTL_ASYNC_BUF_LEN)
+            except Exception as e:
+                # Hand reader errors to the consumer to re-raise
+                post(e)
+            else:
+                post(None)
+                
+        self.is_capturing = True
+        reader = asyncio.ensure_future(asyncio.to_thread(read_async))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                free.append(item)
+        finally:
+            stop.set()
+            cancel_reader()
+            try:
+                # Shielded: on timeout the thread is abandoned, not awaited again
+                await asyncio.wait_for(asyncio.shield(reader), RTL_ASYNC_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("RTL-SDR async reader did not stop; abandoning it")
+            self.is_capturing = False
+            if state["dropped"]:
+                logger.warning(
+                    f"RTL-SDR stream dropped {state['dropped']} transfers (consumer too slow)"
+                )
+                
     async def get_info(self) -> dict:
         """Get extended device information"""
         info = await super().get_info()
@@ -152,6 +278,13 @@ class RTLSDRDevice(SDRDevice):
                 
         return info
 
+# Tones (Hz, amplitude) mixed into the mock signal
+_MOCK_TONES = (
+    (1e3, 0.5),     # 1 kHz tone
+    (10e3, 0.3),    # 10 kHz tone
+    (-5e3, 0.2),    # -5 kHz tone
+)
+
 # Mock implementation for testing without hardware
 class MockRTLSDRDevice(SDRDevice):
     """Mock RTL-SDR for testing"""
@@ -159,6 +292,9 @@ class MockRTLSDRDevice(SDRDevice):
     def __init__(self):
         super().__init__()
         self.device_name = "RTL-SDR (Mock)"
+        self._tone_cache: dict[tuple, np.ndarray] = {}
+        self._rng = np.random.default_rng()
+        self._noise_scratch = np.empty(0, dtype=np.float32)
         logger.info("Using mock RTL-SDR implementation")
         
     async def connect(self) -> bool:
@@ -176,28 +312,56 @@ class MockRTLSDRDevice(SDRDevice):
         
     async def set_sample_rate(self, rate: float):
         self.sample_rate = rate
+        self._tone_cache.clear()
         logger.debug(f"Mock RTL-SDR set sample rate to {rate/1e6:.3f} Msps")
         
     async def set_gain(self, gain: Any):
         self.gain = gain
         logger.debug(f"Mock RTL-SDR set gain to {gain}")
         
+    def _tone_template(self, num_samples: int) -> np.ndarray:
+        """Return the cached complex64 tone mix for the current sample rate"""
+        key = (self.sample_rate, num_samples)
+        template = self._tone_cache.get(key)
+        if template is None:
+            template = np.zeros(num_samples, dtype=np.complex64)
+            # Phase stays float64 so long buffers keep an accurate tone;
+            # everything written to the template is float32
+            index = np.arange(num_samples, dtype=np.float64)
+            phase = np.empty(num_samples)
+            trig = np.empty(num_samples, dtype=np.float32)
+            for freq, amplitude in _MOCK_TONES:
+                np.multiply(index, 2 * np.pi * freq / self.sample_rate, out=phase)
+                amplitude = np.float32(amplitude)
+                np.cos(phase, out=trig)
+                trig *= amplitude
+                template.real += trig
+                np.sin(phase, out=trig)
+                trig *= amplitude
+                template.imag += trig
+            self._tone_cache[key] = template
+        return template
+
     async def read_samples(self, num_samples: int) -> np.ndarray:
         """Generate mock samples with some signals"""
-        # Generate noise
-        noise = (np.random.randn(num_samples) + 
-                1j * np.random.randn(num_samples)) * 0.1
-        
-        # Add a few tones for testing
-        t = np.arange(num_samples) / self.sample_rate
-        
-        # Add some signals at different frequencies
-        signal = noise
-        signal += 0.5 * np.exp(2j * np.pi * 1e3 * t)    # 1 kHz tone
-        signal += 0.3 * np.exp(2j * np.pi * 10e3 * t)   # 10 kHz tone
-        signal += 0.2 * np.exp(2j * np.pi * -5e3 * t)   # -5 kHz tone
-        
-        return signal.astype(np.complex64)
+        signal = np.empty(num_samples, dtype=np.complex64)
+        await self.read_samples_into(signal)
+        return signal
+
+    async def read_samples_into(self, out: np.ndarray) -> int:
+        """Generate mock samples into a caller-owned complex64 buffer"""
+        # Start from the precomputed tones and add fresh noise in place
+        num_samples = len(out)
+        np.copyto(out, self._tone_template(num_samples))
+        iq = out.view(np.float32)
+        # Draw float32 noise into a reused scratch buffer
+        if self._noise_scratch.size < 2 * num_samples:
+            self._noise_scratch = np.empty(2 * num_samples, dtype=np.float32)
+        noise = self._noise_scratch[:2 * num_samples]
+        self._rng.standard_normal(dtype=np.float32, out=noise)
+        noise *= np.float32(0.1)
+        iq += noise
+        return num_samples
 
 # Use mock if hardware not available
 if not RTLSDR_AVAILABLE:
@@ -8,6 +8,8 @@ import json
 import logging
 import os
 import shutil
+from contextlib import aclosing
+from itertools import islice
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -93,6 +95,9 @@ class SDRMCPServer:
         self.audio_recorder = AudioRecorder()
         self.frequency_scanner = FrequencyScanner(self.spectrum_analyzer)
 
+        # Low-pass SOS sections for the FSK/GMSK decoder loops, keyed by (cutoff, fs)
+        self._lowpass_sos: Dict[tuple, np.ndarray] = {}
+
         self.setup_handlers()
         
     def setup_handlers(self):
@@ -771,11 +776,12 @@ class SDRMCPServer:
                 if not messages:
                     result += "No messages decoded yet\n"
                 else:
-                    for msg in messages[-20:]:  # Show last 20
-                        result += f"Address: {msg['address']} (Function {msg['function']})\n"
-                        result += f"Type: {msg['message_type']}\n"
-                        result += f"Message: {msg['message']}\n"
-                        result += f"Time: {msg['timestamp']}\n\n"
+                    # Show last 20 (messages is a bounded deque, so no slicing)
+                    for msg in list(islice(reversed(messages), 20))[::-1]:
+                        result += f"Address: {msg.address} (Function {msg.function})\n"
+                        result += f"Type: {'Numeric' if msg.numeric else 'Alphanumeric'}\n"
+                        result += f"Message: {msg.message}\n"
+                        result += f"Time: {msg.timestamp}\n\n"
 
                 return [TextContent(type="text", text=result)]
 
@@ -968,15 +974,14 @@ class SDRMCPServer:
                 self.spectrum_analyzer.window_type = window
                 self.spectrum_analyzer.window = self.spectrum_analyzer._get_window(window, fft_size)
                 
-                # Read samples
-                samples = await self.sdr.read_samples(fft_size * 2)  # Double for overlap
-                
-                # Analyze spectrum
-                frame = await self.spectrum_analyzer.analyze_spectrum(
-                    samples[:fft_size],
-                    self.sdr.sample_rate,
-                    self.sdr.frequency
-                )
+                # Read samples into a pooled buffer (only the PSD is kept)
+                async with self.sdr.capture(fft_size * 2) as samples:  # Double for overlap
+                    # Analyze spectrum
+                    frame = await self.spectrum_analyzer.analyze_spectrum(
+                        samples[:fft_size],
+                        self.sdr.sample_rate,
+                        self.sdr.frequency
+                    )
                 
                 # Format results
                 result = f"Spectrum Analysis at {frame.center_freq/1e6:.3f} MHz\n"
@@ -1517,33 +1522,48 @@ class SDRMCPServer:
                 self.sdr = RTLSDRDevice()
                 await self.sdr.connect()
 
+    def _get_lowpass_sos(self, cutoff: float, sample_rate: float) -> np.ndarray:
+        """Get a cached 5th-order Butterworth low-pass in second-order sections"""
+        key = (cutoff, sample_rate)
+        sos = self._lowpass_sos.get(key)
+        if sos is None:
+            from scipy import signal
+            sos = signal.butter(5, cutoff / (sample_rate / 2), 'low', output='sos')
+            self._lowpass_sos[key] = sos
+        return sos
+
+    @staticmethod
+    def _fm_discriminate(samples: np.ndarray) -> np.ndarray:
+        """Per-sample phase step, angle(x[n] * conj(x[n-1])) - no unwrap pass needed"""
+        return np.angle(samples[1:] * np.conj(samples[:-1]))
+
     async def _pocsag_decoder_task(self):
         """Background task for POCSAG pager decoding"""
         logger.info("Starting POCSAG decoder task")
 
         try:
-            while True:
-                # Read samples
-                chunk_size = int(self.sdr.sample_rate * 0.5)  # 500ms chunks
-                samples = await self.sdr.read_samples(chunk_size)
+            from scipy import signal
 
-                # Demodulate FSK
-                from scipy import signal
-                # Simple FSK demodulation using frequency discrimination
-                instantaneous_phase = np.unwrap(np.angle(samples))
-                instantaneous_frequency = np.diff(instantaneous_phase)
+            # Stream samples; the next chunk is read while this one is decoded
+            chunk_size = int(self.sdr.sample_rate * 0.5)  # 500ms chunks
+            async with aclosing(self.sdr.stream(chunk_size)) as stream:
+                async for samples in stream:
+                    # Demodulate FSK
+                    # Simple FSK demodulation using frequency discrimination
+                    instantaneous_frequency = self._fm_discriminate(samples)
 
-                # Low-pass filter
-                b, a = signal.butter(5, self.pocsag_decoder.baud_rate * 2 / (self.sdr.sample_rate / 2), 'low')
-                demod = signal.filtfilt(b, a, instantaneous_frequency)
+                    # Low-pass filter
+                    sos = self._get_lowpass_sos(self.pocsag_decoder.baud_rate * 2,
+                                                self.sdr.sample_rate)
+                    demod = signal.sosfiltfilt(sos, instantaneous_frequency)
 
-                # Convert to bits (simple threshold)
-                bits = (demod > np.mean(demod)).astype(int)
+                    # Convert to bits (simple threshold)
+                    bits = (demod > np.mean(demod)).astype(int)
 
-                # Decode POCSAG frames from bit stream
-                # Look for sync pattern and decode codewords
-                # This is simplified - real implementation needs proper frame sync
-                logger.debug(f"POCSAG: processed {len(bits)} bits")
+                    # Decode POCSAG frames from bit stream
+                    # Look for sync pattern and decode codewords
+                    # This is simplified - real implementation needs proper frame sync
+                    logger.debug(f"POCSAG: processed {len(bits)} bits")
 
         except asyncio.CancelledError:
             logger.info("POCSAG decoder task cancelled")
@@ -1557,28 +1577,27 @@ class SDRMCPServer:
         logger.info("Starting AIS decoder task")
 
         try:
-            while True:
-                # Read samples
-                chunk_size = int(self.sdr.sample_rate * 0.5)  # 500ms chunks
-                samples = await self.sdr.read_samples(chunk_size)
+            from scipy import signal
 
-                # Demodulate GMSK (simplified - AIS uses GMSK modulation)
-                # This is a placeholder - real AIS decoding requires proper GMSK demodulation
-                from scipy import signal
+            # Stream samples; the next chunk is read while this one is decoded
+            chunk_size = int(self.sdr.sample_rate * 0.5)  # 500ms chunks
+            async with aclosing(self.sdr.stream(chunk_size)) as stream:
+                async for samples in stream:
+                    # Demodulate GMSK (simplified - AIS uses GMSK modulation)
+                    # This is a placeholder - real AIS decoding requires proper GMSK demodulation
 
-                # FM demodulation
-                instantaneous_phase = np.unwrap(np.angle(samples))
-                instantaneous_frequency = np.diff(instantaneous_phase)
+                    # FM demodulation
+                    instantaneous_frequency = self._fm_discriminate(samples)
 
-                # Low-pass filter for 9600 baud
-                b, a = signal.butter(5, 9600 * 2 / (self.sdr.sample_rate / 2), 'low')
-                demod = signal.filtfilt(b, a, instantaneous_frequency)
+                    # Low-pass filter for 9600 baud
+                    sos = self._get_lowpass_sos(9600 * 2, self.sdr.sample_rate)
+                    demod = signal.sosfiltfilt(sos, instantaneous_frequency)
 
-                # Convert to bits
-                bits = (demod > np.mean(demod)).astype(int)
+                    # Convert to bits
+                    bits = (demod > np.mean(demod)).astype(int)
 
-                # In real implementation, would decode HDLC frames here
-                logger.debug(f"AIS: processed {len(bits)} bits")
+                    # In real implementation, would decode HDLC frames here
+                    logger.debug(f"AIS: processed {len(bits)} bits")
 
         except asyncio.CancelledError:
             logger.info("AIS decoder task cancelled")
@@ -1609,17 +1628,16 @@ class SDRMCPServer:
         logger.info(f"Starting audio recording task ({modulation})")
 
         try:
-            while True:
-                # Read samples in chunks
-                chunk_size = int(self.sdr.sample_rate * 0.1)  # 100ms chunks
-                samples = await self.sdr.read_samples(chunk_size)
-
-                # Demodulate and add to audio recording
-                await self.audio_recorder.add_samples(
-                    samples,
-                    self.sdr.sample_rate,
-                    modulation
-                )
+            # Stream samples in chunks; reading continues during demodulation
+            chunk_size = int(self.sdr.sample_rate * 0.1)  # 100ms chunks
+            async with aclosing(self.sdr.stream(chunk_size)) as stream:
+                async for samples in stream:
+                    # Demodulate and add to audio recording
+                    await self.audio_recorder.add_samples(
+                        samples,
+                        self.sdr.sample_rate,
+                        modulation
+                    )
 
         except asyncio.CancelledError:
             logger.info("Audio recording task cancelled")
@@ -1697,18 +1715,18 @@ class SDRMCPServer:
             msg_count = 0
             last_log_time = asyncio.get_event_loop().time()
 
-            # Read and decode JSON messages
+            # Read and decode JSON messages, 64 KiB of output per read
+            # rather than one readline() round trip per message
+            self.rtl433_decoder.reset_stream()
             while True:
-                line = await process.stdout.readline()
-                if not line:
+                chunk = await process.stdout.read(65536)
+                if not chunk:
                     logger.error("rtl_433 output ended")
                     break
 
-                json_line = line.decode().strip()
-                if json_line:
-                    device = self.rtl433_decoder.parse_message(json_line)
-                    if device:
-                        msg_count += 1
+                for device in self.rtl433_decoder.parse_chunk(chunk):
+                    msg_count += 1
+                    if logger.isEnabledFor(logging.DEBUG):
                         logger.debug(f"Decoded {device.model}: {self.rtl433_decoder.get_device_summary(device)}")
 
                 # Log every 30 seconds
@@ -2,6 +2,7 @@
 Validation utilities for AetherLink
 """
 
+import bisect
 import logging
 import os
 import re
@@ -39,12 +40,26 @@ RESTRICTED_TX_BANDS = [
 ]
 
 
+def _merge_band_edges(bands) -> list:
+    """Merge (possibly overlapping) closed bands into a flat sorted edge list [lo0, hi0, lo1, ...]"""
+    merged = []
+    for low, high in sorted(bands):
+        if merged and low <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], high)
+        else:
+            merged.append([low, high])
+    return [edge for band in merged for edge in band]
+
+
+_RESTRICTED_EDGES = _merge_band_edges(RESTRICTED_TX_BANDS)
+
+
 def is_restricted_frequency(freq: float) -> bool:
     """Check if frequency is in a restricted TX band"""
-    for low, high in RESTRICTED_TX_BANDS:
-        if low <= freq <= high:
-            return True
-    return False
+    # An odd insertion point lands inside a band; bands are closed, so a
+    # frequency sitting exactly on an upper edge counts as well
+    i = bisect.bisect_right(_RESTRICTED_EDGES, freq)
+    return i % 2 == 1 or (i > 0 and _RESTRICTED_EDGES[i - 1] == freq)
 
 
 def sanitize_path_component(name: str) -> str:
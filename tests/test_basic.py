@@ -78,5 +78,290 @@ def test_adsb_decoder_decodes_valid_messages():
     assert stats["descending"] == 1
 
 
+def test_spectrum_psd_locates_tone():
+    """Test PSD peak lands on the tone for complex and real input"""
+    import numpy as np
+    from sdr_mcp.analysis.spectrum import SpectrumAnalyzer
+
+    analyzer = SpectrumAnalyzer(fft_size=1024)
+    sample_rate = 1.024e6
+    t = np.arange(1024) / sample_rate
+
+    iq = np.exp(2j * np.pi * 100e3 * t)
+    freqs, power_db = analyzer.compute_psd(iq, sample_rate)
+    assert len(freqs) == len(power_db) == 1024
+    assert abs(freqs[np.argmax(power_db)] - 100e3) <= sample_rate / 1024
+
+    real = np.cos(2 * np.pi * 100e3 * t)
+    freqs, power_db = analyzer.compute_psd(real, sample_rate)
+    assert len(freqs) == len(power_db) == 513
+    assert freqs[0] == 0
+    assert abs(freqs[np.argmax(power_db)] - 100e3) <= sample_rate / 1024
+
+
+def test_spectrum_welch_matches_psd_scaling():
+    """Test Welch PSD uses the same dB scaling as compute_psd"""
+    import numpy as np
+    from sdr_mcp.analysis.spectrum import SpectrumAnalyzer
+
+    analyzer = SpectrumAnalyzer(fft_size=1024)
+    sample_rate = 1.024e6
+    t = np.arange(8 * 1024) / sample_rate
+    iq = np.exp(2j * np.pi * 100e3 * t)
+
+    freqs, welch_db = analyzer.compute_welch(iq, sample_rate)
+    assert len(freqs) == 1024
+    assert abs(freqs[np.argmax(welch_db)] - 100e3) <= sample_rate / 1024
+
+    _, psd_db = analyzer.compute_psd(iq[:1024], sample_rate)
+    assert abs(np.max(welch_db) - np.max(psd_db)) < 0.1
+
+
+def test_waterfall_ring_order():
+    """Test waterfall ring buffer returns newest lines in order after wrap"""
+    import numpy as np
+    from sdr_mcp.analysis.spectrum import SpectrumAnalyzer
+
+    analyzer = SpectrumAnalyzer()
+    assert len(analyzer.get_waterfall_data(50)) == 0
+
+    for i in range(130):
+        analyzer._append_waterfall(np.full(8, i, dtype=np.float32))
+
+    data = analyzer.get_waterfall_data()
+    assert data.shape == (100, 8)
+    assert data[0, 0] == 30 and data[-1, 0] == 129
+
+    data = analyzer.get_waterfall_data(50)
+    assert list(data[:, 0]) == list(range(80, 130))
+
+    # Level 1 holds pair-averages of consecutive frames
+    data = analyzer.get_waterfall_data(level=1)
+    assert data.shape == (16, 8)
+    assert data[-1, 0] == 128.5 and data[-2, 0] == 126.5
+
+
+def test_audio_filters_continuous_across_chunks():
+    """Test AM DC filter and FM de-emphasis carry state between chunks"""
+    import numpy as np
+    from sdr_mcp.analysis.spectrum import AudioRecorder
+
+    rng = np.random.default_rng(0)
+    iq = (rng.standard_normal(3000) + 1j * rng.standard_normal(3000)).astype(np.complex64)
+    audio = rng.standard_normal(3000)
+
+    whole = AudioRecorder()
+    chunked = AudioRecorder()
+    am = np.concatenate([chunked._am_demodulate(c) for c in np.split(iq, 3)])
+    assert np.allclose(am, whole._am_demodulate(iq))
+
+    fm = np.concatenate([chunked._apply_deemphasis(c, 240e3) for c in np.split(audio, 3)])
+    assert np.allclose(fm, whole._apply_deemphasis(audio, 240e3))
+
+
+def test_ais_decodes_bit_aligned_fields():
+    """Test AIS position and static fields are read at their bit offsets"""
+    from sdr_mcp.decoders.ais import AISDecoder
+
+    def pack(fields, nbits):
+        n = 0
+        for start, width, value in fields:
+            n |= (value & ((1 << width) - 1)) << (nbits - start - width)
+        return n.to_bytes(nbits // 8, 'big')
+
+    def text(s):
+        return [((ord(c) - 64) if c >= '@' else ord(c)) for c in s]
+
+    decoder = AISDecoder()
+    lon, lat = int(-122.4 * 600000), int(37.8 * 600000)
+    position = pack([(0, 6, 1), (8, 30, 366123456), (50, 10, 123), (61, 28, lon), (89, 27, lat),
+                     (116, 12, 2705), (128, 9, 271)], 168)
+    report = decoder.decode_position_report("0", position)
+    assert abs(report['longitude'] + 122.4) < 1e-5
+    assert abs(report['latitude'] - 37.8) < 1e-5
+    assert report['speed'] == 12.3
+    assert report['course'] == 270.5
+    assert report['heading'] == 271.0
+    assert decoder.decode_message(position)['mmsi'] == "366123456"
+
+    callsign = [(70 + 6 * i, 6, v) for i, v in enumerate(text("KXYZ"))]
+    name = [(112 + 6 * i, 6, v) for i, v in enumerate(text("SEA SPRITE"))]
+    static = pack([(0, 6, 5), (232, 8, 70)] + callsign + name, 424)
+    data = decoder.decode_static_data("0", static)
+    assert data['callsign'] == "KXYZ"
+    assert data['name'] == "SEA SPRITE"
+    assert data['ship_type'] == "Cargo"
+    assert data['destination'] is None
+
+
+def test_rtl433_parse_chunk_handles_split_lines():
+    """Test rtl_433 chunk parsing carries partial lines between chunks"""
+    from sdr_mcp.decoders.rtl433 import RTL433Decoder
+
+    decoder = RTL433Decoder()
+    stream = b'{"model": "Acurite", "id": 1, "temperature_C": 21.5}\n\n' \
+             b'{"model": "LaCrosse", "id": 7, "humidity": 40}\n'
+    devices = []
+    for i in range(0, len(stream), 10):
+        devices += decoder.parse_chunk(stream[i:i + 10])
+
+    assert [d.model for d in devices] == ["Acurite", "LaCrosse"]
+    assert devices[0].temperature_C == 21.5
+    assert devices[1].humidity == 40
+
+    # Falsy IDs are not merged into one device
+    decoder.parse_chunk(b'{"model": "Generic", "id": 0}\n{"model": "Generic", "id": 0}\n')
+    assert len(decoder.devices) == 4
+
+
+def test_mock_rtlsdr_read_samples_into():
+    """Test mock RTL-SDR fills a caller-owned buffer with the test tones"""
+    import asyncio
+    import numpy as np
+    from sdr_mcp.hardware.rtlsdr import MockRTLSDRDevice
+
+    device = MockRTLSDRDevice()
+    out = np.zeros(2048, dtype=np.complex64)
+    count = asyncio.run(device.read_samples_into(out))
+
+    assert count == 2048
+    peak_hz = np.argmax(np.abs(np.fft.fft(out))) * device.sample_rate / len(out)
+    assert peak_hz == 1e3
+
+
+def test_mock_rtlsdr_stream_recycles_buffers():
+    """Test streaming reuses a fixed set of buffers"""
+    import asyncio
+    from sdr_mcp.hardware.rtlsdr import MockRTLSDRDevice
+
+    async def collect():
+        device = MockRTLSDRDevice()
+        buffers = set()
+        count = 0
+        async for samples in device.stream(1024, queue_depth=2):
+            assert len(samples) == 1024
+            buffers.add(id(samples.base))
+            count += 1
+            if count == 16:
+                break
+        return buffers
+
+    assert len(asyncio.run(collect())) <= 4
+
+
+def test_signal_recorder_copies_reused_buffers(tmp_path):
+    """Test queued IQ survives the caller reusing its buffer before the flush"""
+    import asyncio
+    import numpy as np
+    from sdr_mcp.analysis.spectrum import SignalRecorder
+
+    async def record():
+        recorder = SignalRecorder(str(tmp_path))
+        recording_id = await recorder.start_recording(100e6, 2.048e6, 20)
+        buf = np.full(1024, 1 + 1j, dtype=np.complex64)
+        await recorder.add_samples(buf)
+        buf[:] = 0
+        await recorder.add_samples(buf)
+        await recorder.stop_recording()
+        return recording_id
+
+    recording_id = asyncio.run(record())
+    data = np.fromfile(tmp_path / f"{recording_id}.iq", dtype=np.complex64)
+    assert np.all(data[:1024] == 1 + 1j)
+    assert np.all(data[1024:] == 0)
+
+
+def test_ais_decode_sixbit_matches_reference():
+    """Test the translate-table sixbit decoder against the per-char formula"""
+    from sdr_mcp.decoders.ais import AISDecoder
+
+    def reference(data):
+        result = []
+        for char in data:
+            val = ord(char) - 48
+            if val > 40:
+                val -= 8
+            result.append(chr(val + 32) if 32 <= val + 32 <= 95 else '?')
+        return ''.join(result).strip('@')
+
+    decoder = AISDecoder()
+    for data in ["15M67FC000G?ufbE`FepT@3n00Sa", "0000", "xyz\x7f\xe9", "13u\u20ac\u00ff?w"]:
+        assert decoder.decode_sixbit(data) == reference(data)
+
+
+def test_pocsag_decoders_match_reference():
+    """Test POCSAG LUT/accumulator/vector decoders against the per-bit originals"""
+    import numpy as np
+    from sdr_mcp.decoders.pocsag import POCSAGDecoder
+
+    def numeric_reference(words):
+        return ''.join("0123456789*U -()"[(w >> (i * 4)) & 0xF]
+                       for w in words for i in range(5)).strip()
+
+    def alphanumeric_reference(words):
+        bits = [(w >> i) & 1 for w in words for i in range(20)]
+        chars = [sum(bit << idx for idx, bit in enumerate(bits[i:i + 7]))
+                 for i in range(0, len(bits) - 6, 7)]
+        return ''.join(chr(c) for c in chars if 32 <= c <= 126).strip()
+
+    decoder = POCSAGDecoder()
+    rng = np.random.default_rng(0)
+    # Lengths straddle the 64-word switch to the vectorized path
+    for length in (0, 1, 2, 7, 63, 64, 65, 130):
+        words = [int(w) for w in rng.integers(0, 1 << 20, length)]
+        assert decoder._decode_numeric(words) == numeric_reference(words)
+        assert decoder._decode_alphanumeric(words) == alphanumeric_reference(words)
+        assert decoder._decode_alphanumeric_vector(words) == alphanumeric_reference(words)
+
+
+def test_restricted_frequency_matches_linear_scan():
+    """Test the bisect band lookup against a scan of every band"""
+    from sdr_mcp.utils.validators import RESTRICTED_TX_BANDS, is_restricted_frequency
+
+    def reference(freq):
+        return any(low <= freq <= high for low, high in RESTRICTED_TX_BANDS)
+
+    probes = [edge + delta for band in RESTRICTED_TX_BANDS for edge in band
+              for delta in (-1.0, 0.0, 1.0)]
+    probes += [f * 1e6 for f in range(0, 3000, 7)]
+    for freq in probes:
+        assert is_restricted_frequency(freq) == reference(freq), freq
+
+
+def test_hackrf_conversions_match_reference():
+    """Test HackRF int8 <-> complex64 conversion against the original formulas"""
+    import numpy as np
+    from sdr_mcp.hardware.hackrf import _complex_to_int8, _int8_to_complex64
+
+    raw = np.arange(-128, 128, dtype=np.int8)
+    expected = raw[0::2].astype(np.float32) / 127.0 + 1j * (raw[1::2].astype(np.float32) / 127.0)
+    assert np.allclose(_int8_to_complex64(raw.tobytes()), expected, rtol=1e-6, atol=0)
+    out = np.empty(10, dtype=np.complex64)
+    _int8_to_complex64(raw.tobytes(), out)
+    assert np.allclose(out, expected[:10], rtol=1e-6, atol=0)
+
+    rng = np.random.default_rng(0)
+    samples = (rng.uniform(-1.5, 1.5, 512) + 1j * rng.uniform(-1.5, 1.5, 512)).astype(np.complex64)
+    reference = np.empty(1024, dtype=np.int8)
+    reference[0::2] = np.clip(samples.real * 127, -127, 127).astype(np.int8)
+    reference[1::2] = np.clip(samples.imag * 127, -127, 127).astype(np.int8)
+    assert np.array_equal(_complex_to_int8(samples), reference)
+
+
+def test_noise_floor_matches_percentile():
+    """Test the partition-based noise floor against np.percentile"""
+    import numpy as np
+    from sdr_mcp.analysis.spectrum import SpectrumAnalyzer
+
+    analyzer = SpectrumAnalyzer()
+    rng = np.random.default_rng(0)
+    for size in (1, 2, 5, 2048, 4097):
+        power_db = rng.normal(-80, 10, size).astype(np.float32)
+        for percentile in (0, 20, 50, 99.5, 100):
+            expected = np.percentile(power_db, percentile)
+            assert np.isclose(analyzer.estimate_noise_floor(power_db, percentile), expected,
+                              rtol=1e-5)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])